@@ -2,236 +2,1470 @@ import discord
 from discord.ext import commands
 from discord import app_commands, Interaction, Member, Guild, Webhook, TextChannel, AuditLogAction, VoiceChannel, StageChannel ,Role , Thread ,StageInstance , User , ScheduledEvent
 import aiohttp
+import asyncio
 from zoneinfo import ZoneInfo
 import datetime
 import json
 import aiosqlite
 import io
-from typing import Union
+import base64
+import re
+import time
+from collections import OrderedDict, deque
+from types import MappingProxyType
+from typing import NamedTuple, Union
 from emojis import *
 DB_PATH = "db/logging_database.db"
+DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA foreign_keys=ON"
+)
+SCHEMA_VERSION = 4
+LOGGING_SCHEMA_V1 = (
+    '''
+    CREATE TABLE IF NOT EXISTS logging_guild_settings (
+        guild_id INTEGER PRIMARY KEY,
+        log_category_id INTEGER,
+        logging_enabled INTEGER NOT NULL DEFAULT 0,
+        ignore_embeds INTEGER NOT NULL DEFAULT 0,
+        voice_log_ignore INTEGER NOT NULL DEFAULT 0
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS logging_routes (
+        guild_id INTEGER NOT NULL REFERENCES logging_guild_settings (guild_id) ON DELETE CASCADE,
+        log_type TEXT NOT NULL,
+        channel_id INTEGER,
+        webhook_url TEXT,
+        PRIMARY KEY (guild_id, log_type)
+    ) WITHOUT ROWID
+    ''',
+    "CREATE INDEX IF NOT EXISTS idx_logging_routes_log_type ON logging_routes (log_type, channel_id)",
+    "CREATE INDEX IF NOT EXISTS idx_logging_routes_channel ON logging_routes (channel_id)",
+    '''
+    CREATE TABLE IF NOT EXISTS logging_ignores (
+        guild_id INTEGER NOT NULL REFERENCES logging_guild_settings (guild_id) ON DELETE CASCADE,
+        entity_type TEXT NOT NULL,
+        entity_id INTEGER NOT NULL,
+        UNIQUE (guild_id, entity_type, entity_id)
+    )
+    ''',
+    "CREATE INDEX IF NOT EXISTS idx_logging_ignores_entity ON logging_ignores (entity_type, entity_id)"
+)
+LOGGING_SCHEMA_V2 = (
+    '''
+    CREATE TABLE IF NOT EXISTS logging_outbox (
+        id INTEGER PRIMARY KEY,
+        guild_id INTEGER NOT NULL,
+        log_type TEXT NOT NULL,
+        embeds TEXT NOT NULL,
+        files TEXT,
+        created_at REAL NOT NULL
+    )
+    ''',
+)
+LOGGING_SCHEMA_V3 = (
+    '''
+    CREATE TABLE IF NOT EXISTS logging_route_stripes (
+        guild_id INTEGER NOT NULL REFERENCES logging_guild_settings (guild_id) ON DELETE CASCADE,
+        log_type TEXT NOT NULL,
+        stripe INTEGER NOT NULL,
+        webhook_url TEXT NOT NULL,
+        PRIMARY KEY (guild_id, log_type, stripe)
+    ) WITHOUT ROWID
+    ''',
+)
+LOGGING_SCHEMA_V4 = (
+    '''
+    CREATE TABLE IF NOT EXISTS logging_outbox_files (
+        outbox_id INTEGER NOT NULL REFERENCES logging_outbox (id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        filename TEXT NOT NULL,
+        description TEXT,
+        spoiler INTEGER NOT NULL DEFAULT 0,
+        data BLOB NOT NULL,
+        PRIMARY KEY (outbox_id, position)
+    )
+    ''',
+)
+SELECT_GUILD_SETTINGS_SQL = "SELECT guild_id, log_category_id, logging_enabled, ignore_embeds, voice_log_ignore FROM logging_guild_settings WHERE guild_id = ?"
+SELECT_GUILD_ROUTES_SQL = "SELECT guild_id, log_type, channel_id, webhook_url FROM logging_routes WHERE guild_id = ?"
+SELECT_GUILD_IGNORES_SQL = "SELECT guild_id, entity_type, entity_id FROM logging_ignores WHERE guild_id = ? ORDER BY rowid"
+SELECT_ALL_GUILD_SETTINGS_SQL = "SELECT guild_id, log_category_id, logging_enabled, ignore_embeds, voice_log_ignore FROM logging_guild_settings"
+SELECT_ALL_ROUTES_SQL = "SELECT guild_id, log_type, channel_id, webhook_url FROM logging_routes"
+SELECT_ALL_IGNORES_SQL = "SELECT guild_id, entity_type, entity_id FROM logging_ignores ORDER BY rowid"
+SELECT_GUILD_STRIPES_SQL = "SELECT guild_id, log_type, stripe, webhook_url FROM logging_route_stripes WHERE guild_id = ?"
+SELECT_ALL_STRIPES_SQL = "SELECT guild_id, log_type, stripe, webhook_url FROM logging_route_stripes"
+UPSERT_GUILD_SETTINGS_SQL = '''
+    INSERT INTO logging_guild_settings (guild_id, log_category_id, logging_enabled, ignore_embeds, voice_log_ignore)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (guild_id) DO UPDATE SET
+        log_category_id = excluded.log_category_id,
+        logging_enabled = excluded.logging_enabled,
+        ignore_embeds = excluded.ignore_embeds,
+        voice_log_ignore = excluded.voice_log_ignore
+'''
+UPSERT_GUILD_ROUTE_SQL = '''
+    INSERT INTO logging_routes (guild_id, log_type, channel_id, webhook_url) VALUES (?, ?, ?, ?)
+    ON CONFLICT (guild_id, log_type) DO UPDATE SET channel_id = excluded.channel_id, webhook_url = excluded.webhook_url
+'''
+DELETE_GUILD_ROUTE_SQL = "DELETE FROM logging_routes WHERE guild_id = ? AND log_type = ?"
+UPSERT_GUILD_STRIPE_SQL = '''
+    INSERT INTO logging_route_stripes (guild_id, log_type, stripe, webhook_url) VALUES (?, ?, ?, ?)
+    ON CONFLICT (guild_id, log_type, stripe) DO UPDATE SET webhook_url = excluded.webhook_url
+'''
+DELETE_GUILD_STRIPE_SQL = "DELETE FROM logging_route_stripes WHERE guild_id = ? AND log_type = ? AND stripe = ?"
+INSERT_GUILD_IGNORE_SQL = "INSERT OR IGNORE INTO logging_ignores (guild_id, entity_type, entity_id) VALUES (?, ?, ?)"
+DELETE_GUILD_IGNORE_SQL = "DELETE FROM logging_ignores WHERE guild_id = ? AND entity_type = ? AND entity_id = ?"
+SELECT_OUTBOX_MAX_ID_SQL = "SELECT COALESCE(MAX(id), 0) FROM logging_outbox"
+SELECT_OUTBOX_PAGE_SQL = "SELECT id, guild_id, log_type, embeds FROM logging_outbox WHERE id > ? AND id <= ? ORDER BY id LIMIT ?"
+SELECT_OUTBOX_FILES_SQL = "SELECT outbox_id, filename, description, spoiler, data FROM logging_outbox_files WHERE outbox_id BETWEEN ? AND ? ORDER BY outbox_id, position"
+INSERT_OUTBOX_SQL = "INSERT OR IGNORE INTO logging_outbox (id, guild_id, log_type, embeds, created_at) VALUES (?, ?, ?, ?, ?)"
+INSERT_OUTBOX_FILE_SQL = "INSERT OR IGNORE INTO logging_outbox_files (outbox_id, position, filename, description, spoiler, data) VALUES (?, ?, ?, ?, ?, ?)"
+DELETE_OUTBOX_SQL = "DELETE FROM logging_outbox WHERE id = ?"
+WEBHOOK_URL_PATTERN = re.compile(r"/webhooks/(\d+)/")
+EMBED_BATCH_MAX_EMBEDS = 10
+EMBED_BATCH_MAX_CHARS = 6000
+WEBHOOK_AUDIT_ACTIONS = (AuditLogAction.webhook_create, AuditLogAction.webhook_delete, AuditLogAction.webhook_update)
+DEFAULT_LOG_PRIORITY = 1
+IGNORE_CONFIG_KEYS = {
+    "channel": "ignored_channels",
+    "user": "ignored_users",
+    "role": "ignored_roles"
+}
+DEFAULT_GUILD_CONFIG = MappingProxyType({
+    "log_category_id": None,
+    "log_channel_ids": MappingProxyType({}),
+    "webhooks": MappingProxyType({}),
+    "webhook_stripes": MappingProxyType({}),
+    "logging_enabled": False,
+    "ignore_embeds": False,
+    "ignored_channels": (),
+    "ignored_users": (),
+    "ignored_roles": (),
+    "voice_log_ignore": False
+})
+def copy_guild_config(config):
+    copied = {}
+    for key, value in config.items():
+        if isinstance(value, (dict, MappingProxyType)):
+            copied[key] = dict(value)
+        elif isinstance(value, (list, tuple)):
+            copied[key] = list(value)
+        else:
+            copied[key] = value
+    return copied
+def build_guild_config(settings_row):
+    _, log_category_id, logging_enabled, ignore_embeds, voice_log_ignore = settings_row
+    config = copy_guild_config(DEFAULT_GUILD_CONFIG)
+    config["log_category_id"] = log_category_id
+    config["logging_enabled"] = bool(logging_enabled)
+    config["ignore_embeds"] = bool(ignore_embeds)
+    config["voice_log_ignore"] = bool(voice_log_ignore)
+    return config
+def apply_guild_route(config, log_type, channel_id, webhook_url):
+    if channel_id is not None:
+        config["log_channel_ids"][log_type] = channel_id
+    if webhook_url is not None:
+        config["webhooks"][log_type] = webhook_url
+def apply_guild_stripe(config, log_type, stripe, webhook_url):
+    config["webhook_stripes"][(log_type, stripe)] = webhook_url
+def get_route_webhook_url(config, log_type, stripe=0):
+    if stripe == 0:
+        return config.get("webhooks", {}).get(log_type)
+    return config.get("webhook_stripes", {}).get((log_type, stripe))
+def set_route_webhook_url(config, log_type, stripe, webhook_url):
+    if stripe == 0:
+        config["webhooks"][log_type] = webhook_url
+    elif webhook_url is None:
+        config["webhook_stripes"].pop((log_type, stripe), None)
+    else:
+        config["webhook_stripes"][(log_type, stripe)] = webhook_url
+def clear_route_webhooks(config, log_type):
+    config.get("webhooks", {}).pop(log_type, None)
+    stripes = config.get("webhook_stripes", {})
+    for key in [key for key in stripes if key[0] == log_type]:
+        del stripes[key]
+def apply_guild_ignore(config, entity_type, entity_id):
+    config_key = IGNORE_CONFIG_KEYS.get(entity_type)
+    if config_key:
+        config[config_key].append(entity_id)
+def guild_config_routes(config):
+    routes = {}
+    for log_type, channel_id in config.get("log_channel_ids", {}).items():
+        routes[log_type] = (channel_id, None)
+    for log_type, webhook_url in config.get("webhooks", {}).items():
+        channel_id, _ = routes.get(log_type, (None, None))
+        routes[log_type] = (channel_id, webhook_url)
+    return {log_type: route for log_type, route in routes.items() if route != (None, None)}
+def guild_config_ignores(config):
+    ignores = []
+    for entity_type, config_key in IGNORE_CONFIG_KEYS.items():
+        ignores.extend((entity_type, entity_id) for entity_id in config.get(config_key, ()))
+    return ignores
+class GuildFilter(NamedTuple):
+    logging_enabled: bool
+    ignore_embeds: bool
+    voice_log_ignore: bool
+    ignored_channels: frozenset
+    ignored_users: frozenset
+    ignored_roles: frozenset
+def compile_guild_filter(config):
+    return GuildFilter(
+        logging_enabled=bool(config.get("logging_enabled", False)),
+        ignore_embeds=bool(config.get("ignore_embeds", False)),
+        voice_log_ignore=bool(config.get("voice_log_ignore", False)),
+        ignored_channels=frozenset(config.get("ignored_channels", ())),
+        ignored_users=frozenset(config.get("ignored_users", ())),
+        ignored_roles=frozenset(config.get("ignored_roles", ()))
+    )
+DEFAULT_GUILD_FILTER = compile_guild_filter(DEFAULT_GUILD_CONFIG)
+class GuildCapabilities(NamedTuple):
+    view_audit_log: bool
+    manage_webhooks: bool
+    manage_guild: bool
+def compile_guild_capabilities(permissions: discord.Permissions):
+    return GuildCapabilities(
+        view_audit_log=permissions.view_audit_log,
+        manage_webhooks=permissions.manage_webhooks,
+        manage_guild=permissions.manage_guild
+    )
+FULL_GUILD_CAPABILITIES = GuildCapabilities(view_audit_log=True, manage_webhooks=True, manage_guild=True)
+class LogAttachment(NamedTuple):
+    filename: str
+    data: bytes
+    description: str | None = None
+    spoiler: bool = False
+    def to_file(self) -> discord.File:
+        return discord.File(io.BytesIO(self.data), filename=self.filename, description=self.description, spoiler=self.spoiler)
+async def read_log_attachment(attachment: discord.Attachment) -> LogAttachment:
+    return LogAttachment(attachment.filename, await attachment.read(), attachment.description, attachment.is_spoiler())
+def decode_outbox_files(encoded):
+    return [
+        LogAttachment(file["filename"], base64.b64decode(file["data"]), file.get("description"), file.get("spoiler", False))
+        for file in encoded or ()
+    ]
 def get_indian_time():
     return datetime.datetime.now(ZoneInfo("Asia/Kolkata"))
 class LoggingCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.guild_configs = {}
+        self.guild_configs = OrderedDict()
+        self.guild_config_cache_size = 10000
         self.session = None
+        self.db = None
+        self.db_lock = asyncio.Lock()
+        self.dirty_guild_configs = {}
+        self.config_flush_task = None
+        self.config_flush_delay = 2.0
+        self.stored_config_guild_ids = set()
+        self.guild_configs_preloaded = False
+        self.config_loads = {}
+        self.guild_filters = {}
+        self.guild_capabilities = {}
+        self.webhook_cache = {}
+        self.webhook_rebuilds = {}
+        self.webhook_stripe_mode = "least_loaded"
+        self.webhook_stripe_cursors = {}
+        self.delivery_max_retries = 2
+        self.delivery_retry_delay = 1.0
+        self.embed_batches = {}
+        self.delivery_lanes = {}
+        self.scheduled_lanes = set()
+        self.ready_lanes = None
+        self.lane_sequence = 0
+        self.delivery_slots = None
+        self.priority_delivery_slots = None
+        self.delivery_workers = []
+        self.delivery_worker_count = 4
+        self.delivery_queue_limit = 2000
+        self.delivery_reserved_slots = 200
+        self.pending_deliveries = 0
+        self.deliveries_drained = asyncio.Event()
+        self.delivery_drain_timeout = 30.0
+        self.webhook_rate_limits = {}
+        self.delivery_stats = {}
+        self.embed_batch_window = 0.5
+        self.outbox_enabled = True
+        self.outbox_next_id = 0
+        self.outbox_inserts = {}
+        self.outbox_acks = set()
+        self.outbox_flush_task = None
+        self.outbox_flush_delay = 0.25
+        self.outbox_replay_task = None
+        self.invite_uses = {}
+        self.invite_refreshes = {}
+        self.invite_seed_task = None
+        self.outbox_replay_rate = 5.0
+        self.outbox_replay_page_size = 100
+        self.admission_window = 10.0
+        self.admission_sample_every = 10
+        self.admission_policies = {
+            "member": (60, "summarize"),
+            "server": (60, "summarize"),
+            "message": (120, "sample"),
+            "thread": (60, "summarize"),
+            "voice": (120, "sample"),
+            "stage": (60, "summarize"),
+            "channel": (60, "summarize"),
+            "role": (60, "summarize")
+        }
+        self.admission_states = {}
+        self.admission_swept_at = 0.0
+        self.delivery_breakers = {}
+        self.audit_log_index = {}
+        self.audit_log_index_size = 500
+        self.audit_log_index_ttl = 120.0
+        self.audit_log_prune_task = None
+        self.audit_log_waiters = {}
+        self.audit_log_wait_timeout = 3.0
+        self.audit_log_fetches = {}
+        self.audit_log_fetch_cache = {}
+        self.audit_log_fetch_limit = 25
+        self.audit_log_fetch_ttl = 5.0
+        self.breaker_failure_threshold = 3
+        self.breaker_base_backoff = 60.0
+        self.breaker_max_backoff = 3600.0
+        self.metrics = {
+            "config_db_loads": 0,
+            "config_db_loads_avoided": 0,
+            "config_cache_hits": 0,
+            "config_cache_misses": 0,
+            "config_cache_evictions": 0,
+            "embeds_batched": 0,
+            "embed_batches_sent": 0,
+            "delivery_backpressure_waits": 0,
+            "outbox_writes": 0,
+            "outbox_replayed": 0,
+            "webhook_rebuilds": 0,
+            "webhook_rebuilds_avoided": 0,
+            "logs_shed": 0,
+            "logs_suspended": 0,
+            "audit_log_index_hits": 0,
+            "audit_log_index_misses": 0,
+            "audit_log_waits_resolved": 0,
+            "audit_log_waits_timed_out": 0,
+            "audit_log_fetches": 0,
+            "audit_log_fetches_avoided": 0,
+            "audit_log_calls_skipped": 0,
+            "webhook_calls_skipped": 0,
+            "invite_fetches": 0,
+            "invite_fetches_avoided": 0
+        }
         self.logging_color = 0xFF5858
         self.log_channel_details = {
-            "system": {"name": "system logs", "emoji": "💻"},
-            "member": {"name": "member logs", "emoji": "👤"},
-            "message": {"name": "message logs", "emoji": "💬"},
-            "thread": {"name": "thread logs", "emoji": "🧵"},
-            "voice": {"name": "voice logs", "emoji": "🔊"},
-            "stage": {"name": "stage logs", "emoji": "🎤"},
-            "moderation": {"name": "moderation logs", "emoji": "🔨"},
-            "channel": {"name": "channel logs", "emoji": "📩"},
-            "server": {"name": "server logs", "emoji": "🌐"},
-            "schedule": {"name": "event logs", "emoji": "📅"},
-            "webhook": {"name": "webhook logs","emoji": "🔗"},
-            "role": {"name": "role logs","emoji": "⚙️"},
-            "application": {"name": "application logs","emoji": "🤖"},
-            "alert": {"name": "alert logs", "emoji": "⚠️"}
+            "system": {"name": "system logs", "emoji": "💻", "priority": 1},
+            "member": {"name": "member logs", "emoji": "👤", "priority": 1},
+            "message": {"name": "message logs", "emoji": "💬", "priority": 2, "webhooks": 2},
+            "thread": {"name": "thread logs", "emoji": "🧵", "priority": 2},
+            "voice": {"name": "voice logs", "emoji": "🔊", "priority": 2, "webhooks": 2},
+            "stage": {"name": "stage logs", "emoji": "🎤", "priority": 2},
+            "moderation": {"name": "moderation logs", "emoji": "🔨", "priority": 0},
+            "channel": {"name": "channel logs", "emoji": "📩", "priority": 1},
+            "server": {"name": "server logs", "emoji": "🌐", "priority": 1},
+            "schedule": {"name": "event logs", "emoji": "📅", "priority": 2},
+            "webhook": {"name": "webhook logs","emoji": "🔗", "priority": 1},
+            "role": {"name": "role logs","emoji": "⚙️", "priority": 1},
+            "application": {"name": "application logs","emoji": "🤖", "priority": 1},
+            "alert": {"name": "alert logs", "emoji": "⚠️", "priority": 0}
         }
         self.log_types = list(self.log_channel_details.keys())
         self.category_name = "💬│Server Logs"
         self.log_view_role_name = "log view"
     async def cog_load(self):
         print("Logging Cog loaded.")
-        self.session = aiohttp.ClientSession()
+        self.session = self._create_http_session()
+        self.start_delivery_workers()
+        await self.open_logging_db()
         await self.initialize_logging_db()
+        await self.preload_guild_configs()
+        await self.start_outbox_replay()
+        self.invite_seed_task = asyncio.create_task(self._seed_invite_uses())
     async def cog_unload(self):
         print("Logging Cog unloaded.")
+        for state in self.admission_states.values():
+            if state["monitor"] and not state["monitor"].done():
+                state["monitor"].cancel()
+        self.admission_states.clear()
+        await self.flush_embed_batches()
+        await self.stop_delivery_workers()
+        for task in (self.audit_log_prune_task, self.invite_seed_task, self.outbox_replay_task, self.outbox_flush_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self.audit_log_prune_task = None
+        self.invite_seed_task = None
+        self.outbox_replay_task = None
+        self.outbox_flush_task = None
+        await self.flush_delivery_outbox()
         if self.session:
             await self.session.close()
             self.session = None
+        self.webhook_cache.clear()
+        if self.config_flush_task and not self.config_flush_task.done():
+            self.config_flush_task.cancel()
+            try:
+                await self.config_flush_task
+            except asyncio.CancelledError:
+                pass
+        self.config_flush_task = None
+        await self.flush_guild_configs()
+        await self.close_logging_db()
+    async def open_logging_db(self):
+        if self.db is not None:
+            return self.db
+        db = await aiosqlite.connect(DB_PATH, cached_statements=64, iter_chunk_size=512)
+        try:
+            for pragma in DB_PRAGMAS:
+                await db.execute(pragma)
+        except Exception:
+            await db.close()
+            raise
+        self.db = db
+        return db
+    async def close_logging_db(self):
+        if self.db is None:
+            return
+        db = self.db
+        self.db = None
+        try:
+            await db.execute("PRAGMA optimize")
+            await db.close()
+        except Exception as e:
+            print(f"Error closing logging database: {e}")
+    async def get_logging_db(self):
+        if self.db is None:
+            return await self.open_logging_db()
+        return self.db
     async def initialize_logging_db(self):
-        async with aiosqlite.connect(DB_PATH) as db:
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS logging_guild_configs (
-                    guild_id INTEGER PRIMARY KEY,
-                    config TEXT
-                )
-            ''')
-            await db.commit()
+        db = await self.get_logging_db()
+        async with self.db_lock:
+            async with db.execute("PRAGMA user_version") as cursor:
+                (version,) = await cursor.fetchone()
+            if version >= SCHEMA_VERSION:
+                return
+            migrations = (
+                (1, self._migrate_schema_v1),
+                (2, self._migrate_schema_v2),
+                (3, self._migrate_schema_v3),
+                (4, self._migrate_schema_v4)
+            )
+            await db.execute("BEGIN IMMEDIATE")
+            try:
+                for target_version, migrate in migrations:
+                    if version < target_version:
+                        await migrate(db)
+                await db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+            print(f"Logging database schema migrated from version {version} to {SCHEMA_VERSION}.")
+    async def _migrate_schema_v1(self, db):
+        for statement in LOGGING_SCHEMA_V1:
+            await db.execute(statement)
+        async with db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'logging_guild_configs'") as cursor:
+            legacy_table = await cursor.fetchone()
+        if not legacy_table:
+            return
+        untouched_config = copy_guild_config(DEFAULT_GUILD_CONFIG)
+        untouched_config.pop("webhook_stripes")
+        migrated = 0
+        async with db.execute("SELECT guild_id, config FROM logging_guild_configs") as cursor:
+            legacy_rows = await cursor.fetchall()
+        for guild_id, config in legacy_rows:
+            try:
+                legacy_config = json.loads(config)
+            except (TypeError, ValueError) as e:
+                print(f"Skipping unreadable legacy logging config for guild {guild_id}: {e}")
+                continue
+            if not isinstance(legacy_config, dict):
+                continue
+            legacy_config.pop("webhook_stripes", None)
+            if legacy_config == untouched_config:
+                continue
+            await self._write_guild_config(db, guild_id, legacy_config)
+            migrated += 1
+        await db.execute("DROP TABLE logging_guild_configs")
+        print(f"Migrated {migrated} legacy JSON logging config(s) to the normalized schema.")
+    async def _migrate_schema_v2(self, db):
+        for statement in LOGGING_SCHEMA_V2:
+            await db.execute(statement)
+    async def _migrate_schema_v3(self, db):
+        for statement in LOGGING_SCHEMA_V3:
+            await db.execute(statement)
+    async def _migrate_schema_v4(self, db):
+        for statement in LOGGING_SCHEMA_V4:
+            await db.execute(statement)
+        async with db.execute("SELECT id, files FROM logging_outbox WHERE files IS NOT NULL") as cursor:
+            legacy_rows = await cursor.fetchall()
+        for outbox_id, files in legacy_rows:
+            try:
+                attachments = decode_outbox_files(json.loads(files))
+            except (TypeError, ValueError, KeyError) as e:
+                print(f"Dropping unreadable attachments of outbox entry {outbox_id}: {e}")
+                attachments = []
+            await db.executemany(INSERT_OUTBOX_FILE_SQL, [
+                (outbox_id, position, attachment.filename, attachment.description, int(attachment.spoiler), attachment.data)
+                for position, attachment in enumerate(attachments)
+            ])
+        await db.execute("UPDATE logging_outbox SET files = NULL WHERE files IS NOT NULL")
+    async def _read_guild_configs(self, db, settings_sql, routes_sql, ignores_sql, stripes_sql, parameters=()):
+        configs = {}
+        async with db.execute(settings_sql, parameters) as cursor:
+            async for row in cursor:
+                configs[row[0]] = build_guild_config(row)
+        async with db.execute(routes_sql, parameters) as cursor:
+            async for guild_id, log_type, channel_id, webhook_url in cursor:
+                if guild_id in configs:
+                    apply_guild_route(configs[guild_id], log_type, channel_id, webhook_url)
+        async with db.execute(ignores_sql, parameters) as cursor:
+            async for guild_id, entity_type, entity_id in cursor:
+                if guild_id in configs:
+                    apply_guild_ignore(configs[guild_id], entity_type, entity_id)
+        async with db.execute(stripes_sql, parameters) as cursor:
+            async for guild_id, log_type, stripe, webhook_url in cursor:
+                if guild_id in configs:
+                    apply_guild_stripe(configs[guild_id], log_type, stripe, webhook_url)
+        return configs
+    async def _write_guild_config(self, db, guild_id: int, config_data: dict):
+        await db.execute(UPSERT_GUILD_SETTINGS_SQL, (
+            guild_id,
+            config_data.get("log_category_id"),
+            int(bool(config_data.get("logging_enabled", False))),
+            int(bool(config_data.get("ignore_embeds", False))),
+            int(bool(config_data.get("voice_log_ignore", False)))
+        ))
+        routes = guild_config_routes(config_data)
+        async with db.execute(SELECT_GUILD_ROUTES_SQL, (guild_id,)) as cursor:
+            stored_routes = {log_type: (channel_id, webhook_url) async for _, log_type, channel_id, webhook_url in cursor}
+        stale_routes = [(guild_id, log_type) for log_type in stored_routes if log_type not in routes]
+        changed_routes = [(guild_id, log_type, *route) for log_type, route in routes.items() if stored_routes.get(log_type) != route]
+        if stale_routes:
+            await db.executemany(DELETE_GUILD_ROUTE_SQL, stale_routes)
+        if changed_routes:
+            await db.executemany(UPSERT_GUILD_ROUTE_SQL, changed_routes)
+        ignores = guild_config_ignores(config_data)
+        async with db.execute(SELECT_GUILD_IGNORES_SQL, (guild_id,)) as cursor:
+            stored_ignores = {(entity_type, entity_id) async for _, entity_type, entity_id in cursor}
+        wanted_ignores = set(ignores)
+        stale_ignores = [(guild_id, *ignore) for ignore in stored_ignores if ignore not in wanted_ignores]
+        new_ignores = [(guild_id, *ignore) for ignore in ignores if ignore not in stored_ignores]
+        if stale_ignores:
+            await db.executemany(DELETE_GUILD_IGNORE_SQL, stale_ignores)
+        if new_ignores:
+            await db.executemany(INSERT_GUILD_IGNORE_SQL, new_ignores)
+        stripes = config_data.get("webhook_stripes")
+        if stripes is None:
+            return
+        async with db.execute(SELECT_GUILD_STRIPES_SQL, (guild_id,)) as cursor:
+            stored_stripes = {(log_type, stripe): webhook_url async for _, log_type, stripe, webhook_url in cursor}
+        stale_stripes = [(guild_id, *key) for key in stored_stripes if key not in stripes]
+        changed_stripes = [(guild_id, *key, webhook_url) for key, webhook_url in stripes.items() if stored_stripes.get(key) != webhook_url]
+        if stale_stripes:
+            await db.executemany(DELETE_GUILD_STRIPE_SQL, stale_stripes)
+        if changed_stripes:
+            await db.executemany(UPSERT_GUILD_STRIPE_SQL, changed_stripes)
+    async def preload_guild_configs(self):
+        started = time.perf_counter()
+        loaded = 0
+        db = await self.get_logging_db()
+        async with self.db_lock:
+            configs = await self._read_guild_configs(db, SELECT_ALL_GUILD_SETTINGS_SQL, SELECT_ALL_ROUTES_SQL, SELECT_ALL_IGNORES_SQL, SELECT_ALL_STRIPES_SQL)
+        for guild_id, loaded_config in configs.items():
+            self.stored_config_guild_ids.add(guild_id)
+            if len(self.guild_configs) < self.guild_config_cache_size:
+                self._cache_guild_config(guild_id, loaded_config, replace=False)
+                loaded += 1
+        self.guild_configs_preloaded = True
+        print(f"Preloaded logging config for {loaded} guild(s) in {(time.perf_counter() - started) * 1000:.1f} ms.")
+        return loaded
     async def get_guild_config_async(self, guild_id: int):
         config_data = self.guild_configs.get(str(guild_id))
         if config_data:
+            self.guild_configs.move_to_end(str(guild_id))
+            self.metrics["config_cache_hits"] += 1
             return config_data
-        async with aiosqlite.connect(DB_PATH) as db:
-            cursor = await db.execute('SELECT config FROM logging_guild_configs WHERE guild_id = ?', (guild_id,))
-            result = await cursor.fetchone()
-            if result:
-                loaded_config = json.loads(result[0])
-                self.guild_configs[str(guild_id)] = loaded_config
-                return loaded_config
-            else:
-                default_config = {
-                    "log_category_id": None,
-                    "log_channel_ids": {},
-                    "webhooks": {},
-                    "logging_enabled": False,
-                    "ignore_embeds": False,
-                    "ignored_channels": [],
-                    "ignored_users": [],
-                    "ignored_roles": [],
-                    "voice_log_ignore": False
-                }
-                await db.execute('INSERT INTO logging_guild_configs (guild_id, config) VALUES (?, ?)',
-                                 (guild_id, json.dumps(default_config)))
-                await db.commit()
-                self.guild_configs[str(guild_id)] = default_config
-                return default_config
+        self.metrics["config_cache_misses"] += 1
+        load = self.config_loads.get(guild_id)
+        if load is not None:
+            self.metrics["config_db_loads_avoided"] += 1
+            return await asyncio.shield(load)
+        load = asyncio.create_task(self._load_guild_config(guild_id))
+        self.config_loads[guild_id] = load
+        load.add_done_callback(lambda _: self.config_loads.pop(guild_id, None))
+        return await asyncio.shield(load)
+    async def _load_guild_config(self, guild_id: int):
+        if guild_id in self.dirty_guild_configs:
+            return self._cache_guild_config(guild_id, self.dirty_guild_configs[guild_id], replace=False)
+        if self.guild_configs_preloaded and guild_id not in self.stored_config_guild_ids:
+            return self._cache_guild_config(guild_id, DEFAULT_GUILD_CONFIG, replace=False)
+        db = await self.get_logging_db()
+        self.metrics["config_db_loads"] += 1
+        async with self.db_lock:
+            configs = await self._read_guild_configs(db, SELECT_GUILD_SETTINGS_SQL, SELECT_GUILD_ROUTES_SQL, SELECT_GUILD_IGNORES_SQL, SELECT_GUILD_STRIPES_SQL, (guild_id,))
+        loaded_config = configs.get(guild_id, DEFAULT_GUILD_CONFIG)
+        return self._cache_guild_config(guild_id, loaded_config, replace=False)
+    def _cache_guild_config(self, guild_id: int, config_data, replace: bool = True):
+        key = str(guild_id)
+        if not replace and key in self.guild_configs:
+            config_data = self.guild_configs[key]
+        else:
+            self.guild_configs[key] = config_data
+        self.guild_configs.move_to_end(key)
+        while len(self.guild_configs) > self.guild_config_cache_size:
+            evicted_key, _ = self.guild_configs.popitem(last=False)
+            self.guild_filters.pop(evicted_key, None)
+            self.metrics["config_cache_evictions"] += 1
+        return config_data
+    def evict_guild_config(self, guild_id: int):
+        if self.guild_configs.pop(str(guild_id), None) is not None:
+            self.metrics["config_cache_evictions"] += 1
+        self.guild_filters.pop(str(guild_id), None)
+    async def get_guild_config_for_update(self, guild_id: int):
+        config_data = await self.get_guild_config_async(guild_id)
+        if config_data is DEFAULT_GUILD_CONFIG:
+            config_data = self._cache_guild_config(guild_id, copy_guild_config(DEFAULT_GUILD_CONFIG))
+        return config_data
+    async def get_guild_filter(self, guild_id: int) -> GuildFilter:
+        guild_filter = self.guild_filters.get(str(guild_id))
+        if guild_filter is not None:
+            return guild_filter
+        config_data = await self.get_guild_config_async(guild_id)
+        if config_data is DEFAULT_GUILD_CONFIG:
+            guild_filter = DEFAULT_GUILD_FILTER
+        else:
+            guild_filter = compile_guild_filter(config_data)
+        self.guild_filters[str(guild_id)] = guild_filter
+        return guild_filter
     async def update_guild_config_async(self, guild_id: int, config_data: dict):
-        self.guild_configs[str(guild_id)] = config_data
-        async with aiosqlite.connect(DB_PATH) as db:
-            await db.execute('INSERT OR REPLACE INTO logging_guild_configs (guild_id, config) VALUES (?, ?)',
-                             (guild_id, json.dumps(config_data)))
-            await db.commit()
-    async def send_embed_files(self, guild: Guild, log_type: str, embed: discord.Embed, files: list[discord.File] = None):
+        self._cache_guild_config(guild_id, config_data)
+        self.guild_filters.pop(str(guild_id), None)
+        self.dirty_guild_configs[guild_id] = config_data
+        if self.config_flush_task is None or self.config_flush_task.done():
+            self.config_flush_task = asyncio.create_task(self._config_flush_loop())
+    async def _config_flush_loop(self):
+        while self.dirty_guild_configs:
+            await asyncio.sleep(self.config_flush_delay)
+            await self.flush_guild_configs()
+    async def flush_guild_configs(self):
+        if not self.dirty_guild_configs:
+            return 0
+        pending = self.dirty_guild_configs
+        self.dirty_guild_configs = {}
+        committed = False
+        try:
+            snapshots = {guild_id: copy_guild_config(config_data) for guild_id, config_data in pending.items()}
+            db = await self.get_logging_db()
+            async with self.db_lock:
+                try:
+                    for guild_id, config_data in snapshots.items():
+                        await self._write_guild_config(db, guild_id, config_data)
+                    await db.commit()
+                    committed = True
+                    self.stored_config_guild_ids.update(pending)
+                except Exception as e:
+                    await db.rollback()
+                    print(f"Error flushing {len(snapshots)} guild config(s) to the database: {e}")
+        finally:
+            if not committed:
+                for guild_id, config_data in pending.items():
+                    self.dirty_guild_configs.setdefault(guild_id, config_data)
+        return len(pending) if committed else 0
+    async def send_embed_files(self, guild: Guild, log_type: str, embed: discord.Embed, files: list[LogAttachment] = None):
         if not guild or not self.session:
             return
-        guild_id = guild.id
-        config = await self.get_guild_config_async(guild_id)
-        if not config.get("logging_enabled"):
+        if self._is_log_suspended(guild.id, log_type, claim_probe=False):
             return
-        log_channel_id = config.get("log_channel_ids", {}).get(log_type)
-        if not log_channel_id:
+        if not await self._resolve_log_channel(guild, log_type) or not self._admit_log(guild, log_type):
             return
-        log_channel = guild.get_channel(log_channel_id)
-        if not log_channel:
+        await self._flush_embed_batch((guild.id, log_type))
+        await self._enqueue_delivery(guild, log_type, [embed], files)
+
+    async def send_embed(self, guild: Guild, log_type: str, embed: discord.Embed, admitted: bool = False):
+        if not guild or not self.session:
             return
-        webhook_url = config.get("webhooks", {}).get(log_type)
-        webhook = None
-        if webhook_url:
+        if self._is_log_suspended(guild.id, log_type, claim_probe=False):
+            return
+        if not await self._resolve_log_channel(guild, log_type) or not (admitted or self._admit_log(guild, log_type)):
+            return
+        if self.embed_batch_window <= 0:
+            await self._enqueue_delivery(guild, log_type, [embed])
+            return
+        key = (guild.id, log_type)
+        embed_size = len(embed)
+        batch = self.embed_batches.get(key)
+        while batch and (len(batch["embeds"]) >= EMBED_BATCH_MAX_EMBEDS or batch["size"] + embed_size > EMBED_BATCH_MAX_CHARS):
+            await self._flush_embed_batch(key, batch)
+            batch = self.embed_batches.get(key)
+        if batch is None:
+            batch = self.embed_batches[key] = {
+                "guild": guild,
+                "embeds": [],
+                "size": 0,
+                "timer": None
+            }
+            batch["timer"] = asyncio.create_task(self._embed_batch_timer(key, batch))
+        batch["embeds"].append(embed)
+        batch["size"] += embed_size
+        self.metrics["embeds_batched"] += 1
+        if len(batch["embeds"]) >= EMBED_BATCH_MAX_EMBEDS:
+            await self._flush_embed_batch(key, batch)
+
+    def _admit_log(self, guild: Guild, log_type: str) -> bool:
+        policy = self.admission_policies.get(log_type)
+        if policy is None:
+            return True
+        limit, overflow = policy
+        key = (guild.id, log_type)
+        now = time.monotonic()
+        if now - self.admission_swept_at >= self.admission_window:
+            self.admission_swept_at = now
+            for idle_key in [idle_key for idle_key, idle in self.admission_states.items() if not idle["shedding"] and now - idle["window_start"] >= self.admission_window]:
+                del self.admission_states[idle_key]
+        state = self.admission_states.get(key)
+        if state is None:
+            state = self.admission_states[key] = {
+                "guild": guild,
+                "window_start": now,
+                "count": 0,
+                "shedding": False,
+                "last_overflow": 0.0,
+                "overflowed": 0,
+                "dropped": 0,
+                "sampled": 0,
+                "summarized": 0,
+                "pending_summary": 0,
+                "monitor": None
+            }
+        if now - state["window_start"] >= self.admission_window:
+            state["window_start"] = now
+            state["count"] = 0
+        state["count"] += 1
+        if state["count"] <= limit:
+            return True
+        state["last_overflow"] = now
+        state["overflowed"] += 1
+        if not state["shedding"]:
+            state["shedding"] = True
+            state["monitor"] = asyncio.create_task(self._monitor_load_shedding(key))
+        if overflow == "sample" and (state["overflowed"] - 1) % self.admission_sample_every == 0:
+            state["sampled"] += 1
+            return True
+        if overflow == "summarize":
+            state["summarized"] += 1
+            state["pending_summary"] += 1
+        else:
+            state["dropped"] += 1
+        self.metrics["logs_shed"] += 1
+        return False
+
+    async def _monitor_load_shedding(self, key: tuple):
+        state = self.admission_states[key]
+        guild, log_type = state["guild"], key[1]
+        limit, overflow = self.admission_policies[log_type]
+        log_name = self.log_channel_details.get(log_type, {}).get("name", log_type)
+        notice = discord.Embed(
+            title="Load Shedding Started",
+            description=(
+                f"> **Log Type :** {log_name.title()}\n"
+                f"> **Limit :** `{limit}` events per `{self.admission_window:g}s`\n"
+                f"> **Overflow Policy :** `{overflow}`"
+            ),
+            color=self.logging_color,
+            timestamp=get_indian_time()
+        )
+        await self.send_embed(guild, "system", notice)
+        while True:
+            await asyncio.sleep(self.admission_window)
+            if state["pending_summary"]:
+                summary = discord.Embed(
+                    title=f"{log_name.title()} Summarized",
+                    description=f"> `{state['pending_summary']}` event(s) in the last `{self.admission_window:g}s` were not logged individually because the {log_name} limit was exceeded.",
+                    color=self.logging_color,
+                    timestamp=get_indian_time()
+                )
+                state["pending_summary"] = 0
+                await self._enqueue_delivery(guild, log_type, [summary])
+            if time.monotonic() - state["last_overflow"] >= self.admission_window:
+                break
+        notice = discord.Embed(
+            title="Load Shedding Stopped",
+            description=(
+                f"> **Log Type :** {log_name.title()}\n"
+                f"> **Overflowed :** `{state['overflowed']}`\n"
+                f"> **Dropped :** `{state['dropped']}`\n"
+                f"> **Summarized :** `{state['summarized']}`\n"
+                f"> **Sampled :** `{state['sampled']}`"
+            ),
+            color=self.logging_color,
+            timestamp=get_indian_time()
+        )
+        if self.admission_states.get(key) is state:
+            del self.admission_states[key]
+        await self.send_embed(guild, "system", notice)
+
+    async def _embed_batch_timer(self, key: tuple, batch: dict):
+        await asyncio.sleep(self.embed_batch_window)
+        await self._flush_embed_batch(key, batch)
+
+    async def _flush_embed_batch(self, key: tuple, batch: dict = None):
+        if batch is None:
+            batch = self.embed_batches.pop(key, None)
+        elif self.embed_batches.get(key) is batch:
+            del self.embed_batches[key]
+        else:
+            return None
+        if not batch:
+            return None
+        if batch["timer"] is not asyncio.current_task():
+            batch["timer"].cancel()
+        self.metrics["embed_batches_sent"] += 1
+        await self._enqueue_delivery(batch["guild"], key[1], batch["embeds"])
+
+    def start_delivery_workers(self):
+        if self.delivery_workers:
+            return
+        self.ready_lanes = asyncio.PriorityQueue()
+        self.delivery_slots = asyncio.Semaphore(self.delivery_queue_limit)
+        self.priority_delivery_slots = asyncio.Semaphore(self.delivery_reserved_slots)
+        self.delivery_workers = [asyncio.create_task(self._delivery_worker()) for _ in range(self.delivery_worker_count)]
+
+    async def stop_delivery_workers(self):
+        if self.pending_deliveries:
             try:
-                webhook = Webhook.from_url(webhook_url, session=self.session)
-            except discord.errors.InvalidWebhook:
-                print(f"Invalid webhook URL for {log_type} in guild {guild_id}. Attempting to re-create.")
-                webhook = await self.create_and_save_webhook_for_channel(guild, log_type, log_channel)
+                await asyncio.wait_for(self.deliveries_drained.wait(), timeout=self.delivery_drain_timeout)
+            except asyncio.TimeoutError:
+                if self.outbox_enabled:
+                    print(f"Leaving {self.pending_deliveries} undelivered log payload(s) in the outbox after waiting {self.delivery_drain_timeout}s.")
+                else:
+                    print(f"Dropping {self.pending_deliveries} undelivered log payload(s) after waiting {self.delivery_drain_timeout}s.")
+        for worker in self.delivery_workers:
+            worker.cancel()
+        if self.delivery_workers:
+            await asyncio.gather(*self.delivery_workers, return_exceptions=True)
+        self.delivery_workers = []
+        self.delivery_lanes.clear()
+        self.scheduled_lanes.clear()
+        self.pending_deliveries = 0
+
+    async def _enqueue_delivery(self, guild: Guild, log_type: str, embeds: list[discord.Embed], files: list[LogAttachment] = None, outbox_id: int = None):
+        if self.delivery_slots is None:
+            return
+        slots = self.delivery_slots
+        if slots.locked() and self._lane_priority(log_type) == 0 and not self.priority_delivery_slots.locked():
+            slots = self.priority_delivery_slots
+        if slots.locked():
+            self.metrics["delivery_backpressure_waits"] += 1
+        await slots.acquire()
+        key = (guild.id, log_type, self._pick_webhook_stripe(guild.id, log_type))
+        lane = self.delivery_lanes.get(key)
+        if lane is None:
+            lane = self.delivery_lanes[key] = deque()
+        item = {
+            "guild": guild,
+            "log_type": log_type,
+            "embeds": embeds,
+            "files": files,
+            "enqueued_at": time.monotonic(),
+            "outbox_id": outbox_id,
+            "stripe": key[2],
+            "slots": slots
+        }
+        if outbox_id is None and self.outbox_enabled and self.db is not None:
+            self._append_to_outbox(item)
+        lane.append(item)
+        self.pending_deliveries += 1
+        self.deliveries_drained.clear()
+        if key not in self.scheduled_lanes:
+            self.scheduled_lanes.add(key)
+            self._schedule_lane(key)
+
+    def _webhook_stripe_count(self, log_type: str) -> int:
+        return max(1, self.log_channel_details.get(log_type, {}).get("webhooks", 1))
+
+    def _pick_webhook_stripe(self, guild_id: int, log_type: str) -> int:
+        count = self._webhook_stripe_count(log_type)
+        if count == 1:
+            return 0
+        if self.webhook_stripe_mode == "round_robin":
+            stripe = (self.webhook_stripe_cursors.get((guild_id, log_type), -1) + 1) % count
+            self.webhook_stripe_cursors[(guild_id, log_type)] = stripe
+            return stripe
+        def stripe_load(stripe):
+            key = (guild_id, log_type, stripe)
+            return (self._lane_rate_limit_delay(key) > 0, len(self.delivery_lanes.get(key, ())) + (key in self.scheduled_lanes))
+        return min(range(count), key=stripe_load)
+
+    def _lane_rate_limit_delay(self, key: tuple) -> float:
+        cached = self.webhook_cache.get(key[0], {}).get((key[1], key[2]))
+        state = self.webhook_rate_limits.get(cached[1].id) if cached else None
+        if not state or state["remaining"] != 0:
+            return 0.0
+        return state["reset_at"] - time.monotonic()
+
+    def _lane_priority(self, log_type: str) -> int:
+        return self.log_channel_details.get(log_type, {}).get("priority", DEFAULT_LOG_PRIORITY)
+
+    def _schedule_lane(self, key: tuple):
+        self.lane_sequence += 1
+        self.ready_lanes.put_nowait((self._lane_priority(key[1]), self.lane_sequence, key))
+
+    async def _delivery_worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            _, _, key = await self.ready_lanes.get()
+            lane = self.delivery_lanes.get(key)
+            if not lane:
+                self.scheduled_lanes.discard(key)
+                self.delivery_lanes.pop(key, None)
+                continue
+            delay = self._lane_rate_limit_delay(key)
+            if delay > 0:
+                self._delivery_stats(key[1])["rate_limit_wait"] += delay
+                loop.call_later(delay, self._schedule_lane, key)
+                continue
+            item = lane.popleft()
+            try:
+                stats = self._delivery_stats(item["log_type"])
+                stats["dequeued"] += 1
+                stats["queue_wait"] += time.monotonic() - item["enqueued_at"]
+                if self._is_log_suspended(item["guild"].id, item["log_type"]):
+                    self._ack_outbox_entry(item)
+                    continue
+                delivered = await self.deliver_log(item["guild"], item["log_type"], item["embeds"], files=item["files"], stripe=item["stripe"])
+                if delivered:
+                    self._record_delivery_latency(item)
+                if delivered is not None:
+                    self._ack_outbox_entry(item)
             except Exception as e:
-                print(f"Error setting up webhook from URL for {log_type}: {e}")
-        if not webhook:
-            print(f"Webhook for {log_type} not found in config or failed to initialize. Attempting to create a new one.")
-            webhook = await self.create_and_save_webhook_for_channel(guild, log_type, log_channel)
-            if not webhook:
-                print(f"Failed to create webhook for {log_type} in guild {guild_id}. Returning.")
-                return
+                print(f"Error delivering {item['log_type']} logs for guild {item['guild'].id}: {e}")
+                self._ack_outbox_entry(item)
+            finally:
+                item["slots"].release()
+                self.pending_deliveries -= 1
+                if self.pending_deliveries <= 0:
+                    self.deliveries_drained.set()
+                if lane:
+                    self._schedule_lane(key)
+                else:
+                    self.scheduled_lanes.discard(key)
+                    if self.delivery_lanes.get(key) is lane:
+                        del self.delivery_lanes[key]
+
+    def _append_to_outbox(self, item: dict):
+        self.outbox_next_id += 1
+        item["outbox_id"] = self.outbox_next_id
+        self.outbox_inserts[item["outbox_id"]] = item
+        self._schedule_outbox_flush()
+
+    def _ack_outbox_entry(self, item: dict):
+        outbox_id = item["outbox_id"]
+        if outbox_id is None:
+            return
+        if self.outbox_inserts.pop(outbox_id, None) is None:
+            self.outbox_acks.add(outbox_id)
+            self._schedule_outbox_flush()
+
+    def _schedule_outbox_flush(self):
+        if self.outbox_flush_task is None or self.outbox_flush_task.done():
+            self.outbox_flush_task = asyncio.create_task(self._outbox_flush_loop())
+
+    async def _outbox_flush_loop(self):
+        while self.outbox_inserts or self.outbox_acks:
+            await asyncio.sleep(self.outbox_flush_delay)
+            await self.flush_delivery_outbox()
+
+    async def flush_delivery_outbox(self):
+        if not self.outbox_inserts and not self.outbox_acks:
+            return 0
+        if self.db is None:
+            return 0
+        inserts = self.outbox_inserts
+        acks = self.outbox_acks
+        self.outbox_inserts = {}
+        self.outbox_acks = set()
+        committed = False
         try:
-            await webhook.send(
-                embed=embed,
-                files=files,
-                username=self.bot.user.name,
-                avatar_url=self.bot.user.avatar.url if self.bot.user.avatar else None
-            )
-        except discord.Forbidden:
-            print(f"Missing permissions to send messages to webhook for {log_type} in guild {guild_id}.")
-        except discord.errors.NotFound:
-            print(f"Webhook for {log_type} in guild {guild_id} not found during send (404). Attempting to re-create and resend.")
-            config["webhooks"][log_type] = None
-            await self.update_guild_config_async(guild_id, config)
-            new_webhook = await self.create_and_save_webhook_for_channel(guild, log_type, log_channel)
-            if new_webhook:
+            rows = [(
+                outbox_id,
+                item["guild"].id,
+                item["log_type"],
+                json.dumps([embed.to_dict() for embed in item["embeds"]]),
+                time.time()
+            ) for outbox_id, item in inserts.items()]
+            file_rows = [
+                (outbox_id, position, attachment.filename, attachment.description, int(attachment.spoiler), attachment.data)
+                for outbox_id, item in inserts.items()
+                for position, attachment in enumerate(file for file in item["files"] or () if file)
+            ]
+            async with self.db_lock:
                 try:
-                    await new_webhook.send(
-                        embed=embed,
-                        files=files,
-                        username=self.bot.user.name,
-                        avatar_url=self.bot.user.avatar.url if self.bot.user.avatar else None
-                    )
-                    print(f"Message successfully resent with new webhook for {log_type} in guild {guild_id}.")
-                except Exception as resend_e:
-                    print(f"Error resending message with new webhook for {log_type}: {resend_e}")
-            else:
-                print(f"Failed to re-create webhook for {log_type} and resend message in guild {guild_id}.")
-        except Exception as e:
-            print(f"Error sending webhook message for {log_type}: {e}")
+                    if rows:
+                        await self.db.executemany(INSERT_OUTBOX_SQL, rows)
+                    if file_rows:
+                        await self.db.executemany(INSERT_OUTBOX_FILE_SQL, file_rows)
+                    if acks:
+                        await self.db.executemany(DELETE_OUTBOX_SQL, [(outbox_id,) for outbox_id in acks])
+                    await self.db.commit()
+                    committed = True
+                    self.metrics["outbox_writes"] += len(rows)
+                except Exception as e:
+                    await self.db.rollback()
+                    print(f"Error flushing {len(rows)} outbox write(s) and {len(acks)} ack(s) to the database: {e}")
+        finally:
+            if not committed:
+                for outbox_id, item in inserts.items():
+                    if outbox_id not in self.outbox_acks:
+                        self.outbox_inserts.setdefault(outbox_id, item)
+                self.outbox_acks.update(acks)
+        return len(inserts) + len(acks) if committed else 0
 
-    async def send_embed(self, guild: Guild, log_type: str, embed: discord.Embed):
-        if not guild or not self.session:
+    async def start_outbox_replay(self):
+        if not self.outbox_enabled:
             return
-        guild_id = guild.id
-        config = await self.get_guild_config_async(guild_id)
-        if not config.get("logging_enabled"):
+        db = await self.get_logging_db()
+        async with self.db_lock:
+            async with db.execute(SELECT_OUTBOX_MAX_ID_SQL) as cursor:
+                (max_id,) = await cursor.fetchone()
+        self.outbox_next_id = max(self.outbox_next_id, max_id)
+        if max_id and (self.outbox_replay_task is None or self.outbox_replay_task.done()):
+            self.outbox_replay_task = asyncio.create_task(self._replay_outbox(max_id))
+
+    async def _replay_outbox(self, max_id: int):
+        await self.bot.wait_until_ready()
+        last_id = 0
+        replayed = 0
+        interval = 1 / self.outbox_replay_rate if self.outbox_replay_rate > 0 else 0
+        while True:
+            db = await self.get_logging_db()
+            async with self.db_lock:
+                async with db.execute(SELECT_OUTBOX_PAGE_SQL, (last_id, max_id, self.outbox_replay_page_size)) as cursor:
+                    rows = await cursor.fetchall()
+                if rows:
+                    page_files = {}
+                    async with db.execute(SELECT_OUTBOX_FILES_SQL, (rows[0][0], rows[-1][0])) as cursor:
+                        async for outbox_id, filename, description, spoiler, data in cursor:
+                            page_files.setdefault(outbox_id, []).append(LogAttachment(filename, data, description, bool(spoiler)))
+            if not rows:
+                break
+            for outbox_id, guild_id, log_type, embeds in rows:
+                last_id = outbox_id
+                guild = self.bot.get_guild(guild_id)
+                replay_files = page_files.get(outbox_id)
+                try:
+                    replay_embeds = [discord.Embed.from_dict(embed) for embed in json.loads(embeds)]
+                except (TypeError, ValueError, KeyError) as e:
+                    print(f"Discarding unreadable outbox entry {outbox_id} for guild {guild_id}: {e}")
+                    guild = None
+                if guild is None:
+                    self.outbox_acks.add(outbox_id)
+                    self._schedule_outbox_flush()
+                    continue
+                await self._enqueue_delivery(guild, log_type, replay_embeds, replay_files, outbox_id=outbox_id)
+                replayed += 1
+                self.metrics["outbox_replayed"] += 1
+                if interval:
+                    await asyncio.sleep(interval)
+        if replayed:
+            print(f"Replayed {replayed} undelivered log payload(s) from the outbox.")
+
+    async def flush_embed_batches(self):
+        for key in list(self.embed_batches):
+            await self._flush_embed_batch(key)
+
+    def _delivery_stats(self, log_type: str) -> dict:
+        stats = self.delivery_stats.get(log_type)
+        if stats is None:
+            stats = self.delivery_stats[log_type] = {
+                "sent": 0,
+                "dequeued": 0,
+                "queue_wait": 0.0,
+                "rate_limit_wait": 0.0,
+                "rate_limited": 0,
+                "delivered": 0,
+                "latency": 0.0,
+                "max_latency": 0.0
+            }
+        return stats
+
+    def _record_delivery_latency(self, item: dict):
+        stats = self._delivery_stats(item["log_type"])
+        latency = time.monotonic() - item["enqueued_at"]
+        stats["delivered"] += 1
+        stats["latency"] += latency
+        stats["max_latency"] = max(stats["max_latency"], latency)
+
+    def get_delivery_metrics(self) -> dict:
+        metrics = {}
+        for log_type in self.log_types:
+            stats = self._delivery_stats(log_type)
+            queue_depth = sum(len(lane) for lane_key, lane in self.delivery_lanes.items() if lane_key[1] == log_type)
+            metrics[log_type] = {
+                "priority": self._lane_priority(log_type),
+                "queue_depth": queue_depth,
+                "sent": stats["sent"],
+                "avg_queue_wait": stats["queue_wait"] / stats["dequeued"] if stats["dequeued"] else 0.0,
+                "rate_limit_wait": stats["rate_limit_wait"],
+                "rate_limited": stats["rate_limited"],
+                "avg_latency": stats["latency"] / stats["delivered"] if stats["delivered"] else 0.0,
+                "max_latency": stats["max_latency"]
+            }
+        return metrics
+
+    def _create_http_session(self) -> aiohttp.ClientSession:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_end.append(self._on_http_request_end)
+        return aiohttp.ClientSession(trace_configs=[trace_config])
+
+    async def _on_http_request_end(self, session, context, params):
+        match = WEBHOOK_URL_PATTERN.search(params.url.path)
+        if not match:
             return
-        log_channel_id = config.get("log_channel_ids", {}).get(log_type)
-        if not log_channel_id:
+        headers = params.response.headers
+        state = self.webhook_rate_limits.setdefault(int(match.group(1)), {"remaining": None, "reset_at": 0.0, "rate_limited": 0})
+        now = time.monotonic()
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        try:
+            if remaining is not None:
+                state["remaining"] = int(remaining)
+            if reset_after is not None:
+                state["reset_at"] = now + float(reset_after)
+            if params.response.status == 429:
+                state["rate_limited"] += 1
+                state["remaining"] = 0
+                retry_after = headers.get("Retry-After")
+                if retry_after is not None:
+                    state["reset_at"] = max(state["reset_at"], now + float(retry_after))
+        except ValueError:
+            pass
+
+    async def _wait_for_webhook_rate_limit(self, webhook_id: int, log_type: str):
+        state = self.webhook_rate_limits.get(webhook_id)
+        if not state or state["remaining"] != 0:
             return
-        log_channel = guild.get_channel(log_channel_id)
+        delay = state["reset_at"] - time.monotonic()
+        if delay > 0:
+            self._delivery_stats(log_type)["rate_limit_wait"] += delay
+            await asyncio.sleep(delay)
+        state["remaining"] = None
+
+    async def deliver_log(self, guild: Guild, log_type: str, embeds: list[discord.Embed], files: list[LogAttachment] = None, stripe: int = 0) -> bool | None:
+        if not guild or not embeds:
+            return False
+        if not self.session:
+            return None
+        log_channel = await self._resolve_log_channel(guild, log_type)
         if not log_channel:
-            return
-        webhook_url = config.get("webhooks", {}).get(log_type)
-        webhook = None
+            return False
+        payload = {
+            "embeds": embeds,
+            "files": [file for file in files or () if file]
+        }
+        return await self._deliver_payload(guild, log_type, log_channel, payload, stripe)
+
+    async def _resolve_log_channel(self, guild: Guild, log_type: str):
+        config = await self.get_guild_config_async(guild.id)
+        if not config.get("logging_enabled"):
+            return None
+        log_channel_id = config.get("log_channel_ids", {}).get(log_type)
+        if not log_channel_id:
+            return None
+        return guild.get_channel(log_channel_id)
+
+    async def _resolve_webhook(self, guild: Guild, log_type: str, log_channel: TextChannel, stripe: int = 0) -> Webhook | None:
+        config = await self.get_guild_config_async(guild.id)
+        webhook_url = get_route_webhook_url(config, log_type, stripe)
         if webhook_url:
             try:
-                webhook = Webhook.from_url(webhook_url, session=self.session)
+                return self.get_cached_webhook(guild.id, log_type, webhook_url, stripe)
             except discord.errors.InvalidWebhook:
-                print(f"Invalid webhook URL for {log_type} in guild {guild_id}. Attempting to re-create.")
-                webhook = await self.create_and_save_webhook_for_channel(guild, log_type, log_channel)
+                print(f"Invalid webhook URL for {log_type} in guild {guild.id}. Attempting to re-create.")
             except Exception as e:
                 print(f"Error setting up webhook from URL for {log_type}: {e}")
-        if not webhook:
+        else:
             print(f"Webhook for {log_type} not found in config or failed to initialize. Attempting to create a new one.")
-            webhook = await self.create_and_save_webhook_for_channel(guild, log_type, log_channel)
-            if not webhook:
-                print(f"Failed to create webhook for {log_type} in guild {guild_id}. Returning.")
-                return
-        try:
-            await webhook.send(
-                embed=embed,
-                username=self.bot.user.name,
-                avatar_url=self.bot.user.avatar.url if self.bot.user.avatar else None
-            )
-        except discord.Forbidden:
-            print(f"Missing permissions to send messages to webhook for {log_type} in guild {guild_id}.")
-        except discord.errors.NotFound:
-            print(f"Webhook for {log_type} in guild {guild_id} not found during send (404). Attempting to re-create and resend.")
-            config["webhooks"][log_type] = None
-            await self.update_guild_config_async(guild_id, config) 
-            new_webhook = await self.create_and_save_webhook_for_channel(guild, log_type, log_channel)
-            if new_webhook:
-                try:
-                    await new_webhook.send(
-                        embed=embed,
-                        username=self.bot.user.name,
-                        avatar_url=self.bot.user.avatar.url if self.bot.user.avatar else None
-                    )
-                    print(f"Message successfully resent with new webhook for {log_type} in guild {guild_id}.")
-                except Exception as resend_e:
-                    print(f"Error resending message with new webhook for {log_type}: {resend_e}")
+        webhook = await self._rebuild_webhook(guild, log_type, log_channel, stripe=stripe)
+        if not webhook:
+            print(f"Failed to create webhook for {log_type} in guild {guild.id}. Returning.")
+        return webhook
+
+    async def _recreate_webhook(self, guild: Guild, log_type: str, log_channel: TextChannel, failed_webhook: Webhook = None, stripe: int = 0) -> Webhook | None:
+        cached = self.webhook_cache.get(guild.id, {}).get((log_type, stripe))
+        if failed_webhook is not None and cached and cached[1].id != failed_webhook.id:
+            self.metrics["webhook_rebuilds_avoided"] += 1
+            return cached[1]
+        return await self._rebuild_webhook(guild, log_type, log_channel, discard_current=True, stripe=stripe)
+
+    async def _rebuild_webhook(self, guild: Guild, log_type: str, log_channel: TextChannel, discard_current: bool = False, stripe: int = 0) -> Webhook | None:
+        key = (guild.id, log_type, stripe)
+        rebuild = self.webhook_rebuilds.get(key)
+        if rebuild is not None:
+            self.metrics["webhook_rebuilds_avoided"] += 1
+            return await asyncio.shield(rebuild)
+        rebuild = asyncio.create_task(self._run_webhook_rebuild(guild, log_type, log_channel, discard_current, stripe))
+        self.webhook_rebuilds[key] = rebuild
+        rebuild.add_done_callback(lambda _: self.webhook_rebuilds.pop(key, None))
+        return await asyncio.shield(rebuild)
+
+    async def _run_webhook_rebuild(self, guild: Guild, log_type: str, log_channel: TextChannel, discard_current: bool, stripe: int) -> Webhook | None:
+        self.metrics["webhook_rebuilds"] += 1
+        if discard_current:
+            self.invalidate_cached_webhook(guild.id, log_type, stripe)
+            config = await self.get_guild_config_for_update(guild.id)
+            set_route_webhook_url(config, log_type, stripe, None)
+            await self.update_guild_config_async(guild.id, config)
+        return await self.create_and_save_webhook_for_channel(guild, log_type, log_channel, stripe=stripe)
+
+    def _classify_delivery_error(self, error: Exception) -> str:
+        if isinstance(error, discord.NotFound):
+            return "not_found"
+        if isinstance(error, discord.Forbidden):
+            return "forbidden"
+        if isinstance(error, discord.HTTPException) and (error.status == 429 or error.status >= 500):
+            return "transient"
+        if isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError)):
+            return "transient"
+        return "fatal"
+
+    async def _deliver_payload(self, guild: Guild, log_type: str, log_channel: TextChannel, payload: dict, stripe: int = 0) -> bool | None:
+        webhook = await self._resolve_webhook(guild, log_type, log_channel, stripe)
+        if not webhook:
+            reason = "webhook unavailable" if self.get_guild_capabilities(guild).manage_webhooks else "missing Manage Webhooks"
+            self._record_destination_failure(guild.id, log_type, reason)
+            return False
+        send_kwargs = {
+            "embeds": payload["embeds"],
+            "username": self.bot.user.name,
+            "avatar_url": self.bot.user.avatar.url if self.bot.user.avatar else None
+        }
+        recreated = False
+        retries = 0
+        while True:
+            if payload["files"]:
+                send_kwargs["files"] = [attachment.to_file() for attachment in payload["files"]]
+            await self._wait_for_webhook_rate_limit(webhook.id, log_type)
+            rate_limit_state = self.webhook_rate_limits.get(webhook.id)
+            rate_limited_before = rate_limit_state["rate_limited"] if rate_limit_state else 0
+            try:
+                await webhook.send(**send_kwargs)
+                self._delivery_stats(log_type)["sent"] += 1
+                self._record_destination_success(guild.id, log_type)
+                if recreated:
+                    print(f"Message successfully resent with new webhook for {log_type} in guild {guild.id}.")
+                return True
+            except Exception as e:
+                error = e
+            finally:
+                rate_limit_state = self.webhook_rate_limits.get(webhook.id)
+                if rate_limit_state and rate_limit_state["rate_limited"] > rate_limited_before:
+                    self._delivery_stats(log_type)["rate_limited"] += rate_limit_state["rate_limited"] - rate_limited_before
+            error_kind = self._classify_delivery_error(error)
+            if error_kind == "not_found" and not recreated:
+                print(f"Webhook for {log_type} in guild {guild.id} not found during send (404). Attempting to re-create and resend.")
+                recreated = True
+                webhook = await self._recreate_webhook(guild, log_type, log_channel, webhook, stripe)
+                if not webhook:
+                    print(f"Failed to re-create webhook for {log_type} and resend message in guild {guild.id}.")
+                    self._record_destination_failure(guild.id, log_type, "webhook not found")
+                    return False
+                continue
+            if error_kind == "transient":
+                if retries < self.delivery_max_retries:
+                    retries += 1
+                    await asyncio.sleep(self.delivery_retry_delay * 2 ** (retries - 1))
+                    continue
+                print(f"Giving up on {log_type} delivery for guild {guild.id} after {retries} retries, keeping it for replay: {error}")
+                return None
+            if error_kind in ("forbidden", "not_found"):
+                self._record_destination_failure(guild.id, log_type, "missing permissions" if error_kind == "forbidden" else "webhook not found")
+            if error_kind == "forbidden":
+                print(f"Missing permissions to send messages to webhook for {log_type} in guild {guild.id}.")
+            elif recreated:
+                print(f"Error resending message with new webhook for {log_type}: {error}")
             else:
-                print(f"Failed to re-create webhook for {log_type} and resend message in guild {guild_id}.")
-        except Exception as e:
-            print(f"Error sending webhook message for {log_type}: {e}")
+                print(f"Error sending webhook message for {log_type}: {error}")
+            return False
 
-    async def create_and_save_webhook_for_channel(self, guild: Guild, log_type: str, channel: TextChannel) -> Webhook | None:
-        config = await self.get_guild_config_async(guild.id)
+    def _is_log_suspended(self, guild_id: int, log_type: str, claim_probe: bool = True) -> bool:
+        breaker = self.delivery_breakers.get((guild_id, log_type))
+        if not breaker or breaker["opened_at"] is None:
+            return False
+        now = time.monotonic()
+        if now >= breaker["retry_at"]:
+            if claim_probe:
+                breaker["retry_at"] = now + breaker["backoff"]
+                breaker["probing"] = True
+            return False
+        self.metrics["logs_suspended"] += 1
+        return True
+
+    def _record_destination_failure(self, guild_id: int, log_type: str, reason: str):
+        breaker = self.delivery_breakers.get((guild_id, log_type))
+        if breaker is None:
+            breaker = self.delivery_breakers[(guild_id, log_type)] = {
+                "failures": 0,
+                "opened_at": None,
+                "retry_at": 0.0,
+                "backoff": self.breaker_base_backoff,
+                "probing": False,
+                "reason": reason
+            }
+        breaker["failures"] += 1
+        breaker["reason"] = reason
+        now = time.monotonic()
+        if breaker["opened_at"] is not None:
+            if breaker["probing"]:
+                breaker["probing"] = False
+                breaker["backoff"] = min(breaker["backoff"] * 2, self.breaker_max_backoff)
+                breaker["retry_at"] = now + breaker["backoff"]
+        elif breaker["failures"] >= self.breaker_failure_threshold:
+            breaker["opened_at"] = time.time()
+            breaker["retry_at"] = now + breaker["backoff"]
+            print(f"Suspending {log_type} logs for guild {guild_id} after {breaker['failures']} failed deliveries ({reason}). Next probe in {breaker['backoff']:.0f}s.")
+
+    def _record_destination_success(self, guild_id: int, log_type: str):
+        breaker = self.delivery_breakers.pop((guild_id, log_type), None)
+        if breaker and breaker["opened_at"] is not None:
+            print(f"Resuming {log_type} logs for guild {guild_id} after a successful probe.")
+
+    def reset_destination_breakers(self, guild_id: int, log_type: str = None):
+        if log_type is not None:
+            self.delivery_breakers.pop((guild_id, log_type), None)
+            return
+        for key in [key for key in self.delivery_breakers if key[0] == guild_id]:
+            del self.delivery_breakers[key]
+
+    def get_guild_capabilities(self, guild: Guild) -> GuildCapabilities:
+        capabilities = self.guild_capabilities.get(guild.id)
+        if capabilities is not None:
+            return capabilities
+        if guild.me is None:
+            return FULL_GUILD_CAPABILITIES
+        capabilities = self.guild_capabilities[guild.id] = compile_guild_capabilities(guild.me.guild_permissions)
+        return capabilities
+
+    def invalidate_guild_capabilities(self, guild_id: int):
+        self.guild_capabilities.pop(guild_id, None)
+
+    async def _seed_invite_uses(self):
+        await self.bot.wait_until_ready()
+        for guild in self.bot.guilds:
+            if guild.id in self.invite_uses or not self.get_guild_capabilities(guild).manage_guild:
+                continue
+            config = await self.get_guild_config_async(guild.id)
+            if not config.get("logging_enabled") or not config.get("log_channel_ids", {}).get("server"):
+                continue
+            try:
+                invites = await self.refresh_guild_invites(guild)
+            except discord.HTTPException as e:
+                print(f"Error seeding invite uses for guild {guild.id}: {e}")
+                continue
+            self.invite_uses.setdefault(guild.id, {invite.code: invite.uses or 0 for invite in invites})
+
+    async def refresh_guild_invites(self, guild: Guild) -> list:
+        refresh = self.invite_refreshes.get(guild.id)
+        if refresh is not None and not refresh["started"]:
+            self.metrics["invite_fetches_avoided"] += 1
+            return await asyncio.shield(refresh["task"])
+        previous = refresh["task"] if refresh else None
+        refresh = {"task": None, "started": False}
+        refresh["task"] = asyncio.create_task(self._refresh_guild_invites(guild, previous, refresh))
+        self.invite_refreshes[guild.id] = refresh
+        refresh["task"].add_done_callback(lambda _: self.invite_refreshes.pop(guild.id, None) if self.invite_refreshes.get(guild.id) is refresh else None)
+        return await asyncio.shield(refresh["task"])
+
+    async def _refresh_guild_invites(self, guild: Guild, previous: asyncio.Task, refresh: dict) -> list:
+        if previous is not None:
+            await asyncio.wait([previous])
+        refresh["started"] = True
+        self.metrics["invite_fetches"] += 1
+        return await guild.invites()
+
+    async def detect_used_invite(self, guild: Guild) -> discord.Invite | None:
+        if not self.get_guild_capabilities(guild).manage_guild:
+            return None
+        invites = await self.refresh_guild_invites(guild)
+        known_uses = self.invite_uses.get(guild.id)
+        if known_uses is None:
+            self.invite_uses[guild.id] = {invite.code: invite.uses or 0 for invite in invites}
+            return None
+        current_codes = {invite.code for invite in invites}
+        for code in [code for code in known_uses if code not in current_codes]:
+            del known_uses[code]
+        for invite in invites:
+            if (invite.uses or 0) > known_uses.get(invite.code, 0):
+                known_uses[invite.code] = known_uses.get(invite.code, 0) + 1
+                return invite
+        return None
+
+    def get_cached_webhook(self, guild_id: int, log_type: str, webhook_url: str, stripe: int = 0) -> Webhook:
+        guild_webhooks = self.webhook_cache.setdefault(guild_id, {})
+        cached = guild_webhooks.get((log_type, stripe))
+        if cached and cached[0] == webhook_url:
+            return cached[1]
+        webhook = Webhook.from_url(webhook_url, session=self.session)
+        guild_webhooks[(log_type, stripe)] = (webhook_url, webhook)
+        return webhook
+
+    def invalidate_cached_webhook(self, guild_id: int, log_type: str = None, stripe: int = None):
+        if log_type is None:
+            self.webhook_cache.pop(guild_id, None)
+        elif guild_id in self.webhook_cache:
+            guild_webhooks = self.webhook_cache[guild_id]
+            if stripe is not None:
+                guild_webhooks.pop((log_type, stripe), None)
+                return
+            for key in [key for key in guild_webhooks if key[0] == log_type]:
+                del guild_webhooks[key]
+
+    async def create_and_save_webhook_for_channel(self, guild: Guild, log_type: str, channel: TextChannel, stripe: int = None) -> Webhook | None:
+        config = await self.get_guild_config_for_update(guild.id)
         if not config:
             return None
+        stripe_count = self._webhook_stripe_count(log_type)
+        stripes = range(stripe_count) if stripe is None else (stripe,)
+        provisioned = []
+        if not self.get_guild_capabilities(guild).manage_webhooks:
+            self.metrics["webhook_calls_skipped"] += 1
+            return None
         try:
-            existing_webhooks = await channel.webhooks()
-            for webhook in existing_webhooks:
-                if webhook.user and webhook.user.id == self.bot.user.id:
-                    config["webhooks"][log_type] = webhook.url
-                    await self.update_guild_config_async(guild.id, config)
-                    return webhook
-            bot_avatar_url = self.bot.user.avatar.url if self.bot.user.avatar else None
-            webhook_name = f"{self.bot.user.name} Logging"
-            webhook = await channel.create_webhook(
-                name=webhook_name,
-                avatar=await self.bot.user.avatar.read() if bot_avatar_url else None,
-                reason=f"For {log_type} logging by {self.bot.user.name}"
-            )
-            config["webhooks"][log_type] = webhook.url
-            await self.update_guild_config_async(guild.id, config)
-            return webhook
+            existing_webhooks = [webhook for webhook in await channel.webhooks() if webhook.user and webhook.user.id == self.bot.user.id]
+            for current in stripes:
+                claimed = {get_route_webhook_url(config, log_type, other) for other in range(max(stripe_count, current + 1)) if other != current}
+                webhook = next((webhook for webhook in existing_webhooks if webhook.url not in claimed), None)
+                if webhook is None:
+                    bot_avatar_url = self.bot.user.avatar.url if self.bot.user.avatar else None
+                    webhook_name = f"{self.bot.user.name} Logging"
+                    webhook = await channel.create_webhook(
+                        name=webhook_name,
+                        avatar=await self.bot.user.avatar.read() if bot_avatar_url else None,
+                        reason=f"For {log_type} logging by {self.bot.user.name}"
+                    )
+                    existing_webhooks.append(webhook)
+                set_route_webhook_url(config, log_type, current, webhook.url)
+                self.invalidate_cached_webhook(guild.id, log_type, current)
+                provisioned.append(current)
         except discord.Forbidden:
             print(f"Missing 'Manage Webhooks' permission in {channel.mention} to set up {log_type} logging webhooks for guild {guild.id}.")
-            return None
         except Exception as e:
             print(f"Error creating webhook for {log_type} in guild {guild.id}: {e}")
+        if not provisioned:
             return None
+        if stripe is None:
+            for key in [key for key in config["webhook_stripes"] if key[0] == log_type and key[1] >= len(provisioned)]:
+                del config["webhook_stripes"][key]
+                self.invalidate_cached_webhook(guild.id, log_type, key[1])
+        await self.update_guild_config_async(guild.id, config)
+        return self.get_cached_webhook(guild.id, log_type, get_route_webhook_url(config, log_type, stripes[0]), stripes[0])
 
     logging_group = app_commands.Group(name="logging", description="Manage logging in the server.", default_permissions=discord.Permissions(administrator=True) , guild_only=True)
     setup_group = app_commands.Group(name="setup", parent=logging_group, description="Commands to set up logging.")
@@ -278,13 +1512,15 @@ class LoggingCog(commands.Cog):
             except Exception as e:
                 await interaction.followup.send(f"Error updating logging category permissions: {e}", ephemeral=True)
                 return
-        config = await self.get_guild_config_async(guild.id)
+        config = await self.get_guild_config_for_update(guild.id)
         config["logging_enabled"] = True
         config["log_category_id"] = category.id
         if "log_channel_ids" not in config:
             config["log_channel_ids"] = {}
         if "webhooks" not in config:
             config["webhooks"] = {}
+        if "webhook_stripes" not in config:
+            config["webhook_stripes"] = {}
         created_or_updated_channels_mentions = []
         for log_type, details in self.log_channel_details.items():
             channel_name = details["name"]
@@ -297,8 +1533,7 @@ class LoggingCog(commands.Cog):
                 else:
                     if log_type in config.get("log_channel_ids", {}):
                         del config["log_channel_ids"][log_type]
-                    if log_type in config.get("webhooks", {}):
-                        del config["webhooks"][log_type]
+                    clear_route_webhooks(config, log_type)
             if not channel_to_use:
                 try:
                     channel_to_use = await guild.create_text_channel(
@@ -326,6 +1561,7 @@ class LoggingCog(commands.Cog):
                 except Exception as e:
                     print(f"Failed to set up webhook for {log_type} in {channel_to_use.mention}: {e}")
         await self.update_guild_config_async(guild.id, config)
+        self.reset_destination_breakers(guild.id)
         if created_or_updated_channels_mentions:
             await interaction.followup.send(f"Automatic logging setup complete! Created/updated category {category.mention} and configured channels: {', '.join(created_or_updated_channels_mentions)}.", ephemeral=True)
         else:
@@ -354,7 +1590,7 @@ class LoggingCog(commands.Cog):
             await interaction.response.send_message("This command can only be used in a server.", ephemeral=True)
             return
         await interaction.response.defer(ephemeral=True)
-        config = await self.get_guild_config_async(guild.id)
+        config = await self.get_guild_config_for_update(guild.id)
         config["logging_enabled"] = True
         current_log_type = log_type.value
         channel_to_use = channel
@@ -377,7 +1613,7 @@ class LoggingCog(commands.Cog):
             await interaction.response.send_message("This command can only be used in a server.", ephemeral=True)
             return
         await interaction.response.defer(ephemeral=True)
-        config = await self.get_guild_config_async(guild.id)
+        config = await self.get_guild_config_for_update(guild.id)
         config["logging_enabled"] = True
         config["log_channel_ids"][log_type] = channel.id
         try:
@@ -389,6 +1625,7 @@ class LoggingCog(commands.Cog):
             await interaction.followup.send(f"An error occurred while creating the webhook for {log_type} logs: {e}", ephemeral=True)
             return
         await self.update_guild_config_async(guild.id, config)
+        self.reset_destination_breakers(guild.id, log_type)
         await interaction.followup.send(f"Successfully set up `{log_type} logs` in {channel.mention}.", ephemeral=True)
 
     @logging_group.command(name="system_logs", description="Sets the channel for system logs.")
@@ -470,7 +1707,7 @@ class LoggingCog(commands.Cog):
             await interaction.response.send_message("This command can only be used in a server.", ephemeral=True)
             return 
         await interaction.response.defer(ephemeral=True)
-        config = await self.get_guild_config_async(guild.id)
+        config = await self.get_guild_config_for_update(guild.id)
         log_type_value = log_type.value
         current_channel_id = config.get("log_channel_ids", {}).get(log_type_value)
         if not current_channel_id:
@@ -478,8 +1715,8 @@ class LoggingCog(commands.Cog):
             return
         if log_type_value in config.get("log_channel_ids", {}):
             del config["log_channel_ids"][log_type_value]
-        if log_type_value in config.get("webhooks", {}):
-            del config["webhooks"][log_type_value]
+        clear_route_webhooks(config, log_type_value)
+        self.invalidate_cached_webhook(guild.id, log_type_value)
         await self.update_guild_config_async(guild.id, config)
         await interaction.followup.send(f"Logging for `{log_type.name}` has been disabled.", ephemeral=True)
 
@@ -490,7 +1727,7 @@ class LoggingCog(commands.Cog):
     ])
     async def toggle_logging(self, interaction: Interaction, state: app_commands.Choice[str]):
         guild_id = interaction.guild.id
-        config = await self.get_guild_config_async(guild_id)
+        config = await self.get_guild_config_for_update(guild_id)
         config["logging_enabled"] = (state.value.lower() == "on")
         await self.update_guild_config_async(guild_id, config)
         await interaction.response.send_message(f"Logging for this server has been turned {state.value.lower()}.", ephemeral=True)
@@ -541,6 +1778,33 @@ class LoggingCog(commands.Cog):
                 value="\n".join(channel_status_lines),
                 inline=False
             )
+        suspended_lines = []
+        for (breaker_guild_id, log_type), breaker in self.delivery_breakers.items():
+            if breaker_guild_id != guild.id or breaker["opened_at"] is None:
+                continue
+            log_name = self.log_channel_details.get(log_type, {}).get("name", log_type).title()
+            next_probe = int(time.time() + max(breaker["retry_at"] - time.monotonic(), 0))
+            suspended_lines.append(f"- **{log_name}** : {breaker['reason']} since <t:{int(breaker['opened_at'])}:R>, next retry <t:{next_probe}:R>")
+        if suspended_lines:
+            status_embed.add_field(
+                name="Suspended Destinations",
+                value="\n".join(suspended_lines),
+                inline=False
+            )
+        capabilities = self.get_guild_capabilities(guild)
+        missing_permissions = []
+        if not capabilities.view_audit_log:
+            missing_permissions.append("- **View Audit Log** : moderator attribution and reasons are skipped")
+        if not capabilities.manage_webhooks:
+            missing_permissions.append("- **Manage Webhooks** : log webhooks cannot be created or repaired")
+        if not capabilities.manage_guild:
+            missing_permissions.append("- **Manage Server** : joins cannot be matched to the invite used")
+        if missing_permissions:
+            status_embed.add_field(
+                name="Missing Permissions",
+                value="\n".join(missing_permissions),
+                inline=False
+            )
         ignored_channel_ids = config.get("ignored_channels", [])
         ignored_channels_mentions = [f"<#{cid}>" for cid in ignored_channel_ids]
         status_embed.add_field(
@@ -569,6 +1833,37 @@ class LoggingCog(commands.Cog):
             status_embed.set_footer(text=self.bot.user.name)
         await interaction.followup.send(embed=status_embed)
 
+    @logging_group.command(name="metrics", description="Show log delivery metrics for each log type.")
+    async def logging_metrics(self, interaction: Interaction):
+        metrics_embed = discord.Embed(
+            title="Delivery Metrics",
+            description=(
+                f"> **Pending Deliveries :** `{self.pending_deliveries}`\n"
+                f"> **Backpressure Waits :** `{self.metrics['delivery_backpressure_waits']}`\n"
+                f"> **Logs Shed :** `{self.metrics['logs_shed']}`\n"
+                f"> **Logs Suspended :** `{self.metrics['logs_suspended']}`"
+            ),
+            color=self.logging_color,
+            timestamp=get_indian_time()
+        )
+        for log_type, stats in self.get_delivery_metrics().items():
+            if not stats["sent"] and not stats["queue_depth"]:
+                continue
+            log_name = self.log_channel_details.get(log_type, {}).get("name", log_type).title()
+            metrics_embed.add_field(
+                name=log_name,
+                value=(
+                    f"> **Priority :** `{stats['priority']}`\n"
+                    f"> **Queued :** `{stats['queue_depth']}`\n"
+                    f"> **Sent :** `{stats['sent']}`\n"
+                    f"> **Avg Queue Wait :** `{stats['avg_queue_wait']:.2f}s`\n"
+                    f"> **Rate Limited :** `{stats['rate_limited']}` (`{stats['rate_limit_wait']:.1f}s`)\n"
+                    f"> **Latency :** `{stats['avg_latency']:.2f}s` avg, `{stats['max_latency']:.2f}s` max"
+                ),
+                inline=True
+            )
+        await interaction.response.send_message(embed=metrics_embed, ephemeral=True)
+
     @logging_group.command(name="help", description="Shows how to fully set up the logging system.")
     async def logging_help(self, interaction: Interaction):
         description = (
@@ -618,12 +1913,14 @@ class LoggingCog(commands.Cog):
             await interaction.response.send_message("This command can only be used in a server.", ephemeral=True)
             return
         await interaction.response.defer(ephemeral=True)
-        config = await self.get_guild_config_async(guild.id)
+        config = await self.get_guild_config_for_update(guild.id)
         config["logging_enabled"] = False
         config["log_category_id"] = None
         config["log_channel_ids"] = {}
         config["webhooks"] = {}
+        config["webhook_stripes"] = {}
         await self.update_guild_config_async(guild.id, config)
+        self.reset_destination_breakers(guild.id)
         description_content = []
         description_content.append(f"> **__Logging Setup Clear Report__**\n")
         description_content.append(f"> Logging has been stopped and its configuration cleared from the database.\n")
@@ -649,7 +1946,7 @@ class LoggingCog(commands.Cog):
     ])
     async def logging_ignore_embed(self, interaction: Interaction, state: app_commands.Choice[str]):
         guild_id = interaction.guild.id
-        config = await self.get_guild_config_async(guild_id)
+        config = await self.get_guild_config_for_update(guild_id)
         is_enabled = state.value.lower() == "enabled"
         config["ignore_embeds"] = is_enabled
         await self.update_guild_config_async(guild_id, config)
@@ -666,7 +1963,7 @@ class LoggingCog(commands.Cog):
     @ignore_group.command(name="channel", description="Ignore a channel from being logged.")
     async def ignore_channel(self, interaction: Interaction, channel: Union[TextChannel, VoiceChannel, StageChannel]):
         guild_id = interaction.guild.id
-        config = await self.get_guild_config_async(guild_id)
+        config = await self.get_guild_config_for_update(guild_id)
         if channel.id not in config["ignored_channels"]:
             config["ignored_channels"].append(channel.id)
             await self.update_guild_config_async(guild_id, config)
@@ -677,7 +1974,7 @@ class LoggingCog(commands.Cog):
     @ignore_group.command(name="user", description="Ignore a user from being logged.")
     async def ignore_user(self, interaction: Interaction, user: Member):
         guild_id = interaction.guild.id
-        config = await self.get_guild_config_async(guild_id)
+        config = await self.get_guild_config_for_update(guild_id)
         if user.id not in config["ignored_users"]:
             config["ignored_users"].append(user.id)
             await self.update_guild_config_async(guild_id, config)
@@ -688,7 +1985,7 @@ class LoggingCog(commands.Cog):
     @ignore_group.command(name="role", description="Ignore a role from being logged.")
     async def ignore_role(self, interaction: Interaction, role: Role):
         guild_id = interaction.guild.id
-        config = await self.get_guild_config_async(guild_id)
+        config = await self.get_guild_config_for_update(guild_id)
         if role.id not in config["ignored_roles"]:
             config["ignored_roles"].append(role.id)
             await self.update_guild_config_async(guild_id, config)
@@ -703,7 +2000,7 @@ class LoggingCog(commands.Cog):
     ])
     async def ignore_voice(self, interaction: Interaction, state: app_commands.Choice[str]):
         guild_id = interaction.guild.id
-        config = await self.get_guild_config_async(guild_id)
+        config = await self.get_guild_config_for_update(guild_id)
         is_enabled = state.value.lower() == "enable"
         config["voice_log_ignore"] = is_enabled
         await self.update_guild_config_async(guild_id, config)
@@ -743,7 +2040,7 @@ class LoggingCog(commands.Cog):
     async def ignore_remove(self, interaction: Interaction, entity: str):
         guild = interaction.guild
         guild_id = guild.id
-        config = await self.get_guild_config_async(guild_id)
+        config = await self.get_guild_config_for_update(guild_id)
         try:
             entity_type, entity_id_str = entity.split("_")
             entity_id = int(entity_id_str)
@@ -776,23 +2073,46 @@ class LoggingCog(commands.Cog):
         else:
             await interaction.response.send_message("Could not find the specified entity in the ignored list.", ephemeral=True)
 
-    async def _is_ignored(self, guild_id: int, user: Member = None, channel: Union[TextChannel, VoiceChannel, StageChannel] = None) -> bool:
-        config = await self.get_guild_config_async(guild_id)
-        if not config.get("logging_enabled", False):
+    async def _is_ignored(self, guild_id: int, user: Member = None, channel: Union[TextChannel, VoiceChannel, StageChannel] = None, log_type: str = None) -> bool:
+        if log_type and self._is_log_suspended(guild_id, log_type, claim_probe=False):
+            return True
+        guild_filter = await self.get_guild_filter(guild_id)
+        if not guild_filter.logging_enabled:
             return True
-        if channel and channel.id in config.get("ignored_channels", []):
+        if channel and channel.id in guild_filter.ignored_channels:
             return True
         if user:
-            if user.id in config.get("ignored_users", []):
+            if user.id in guild_filter.ignored_users:
                 return True
-            user_roles = getattr(user, 'roles', [])
-            if any(role.id in config.get("ignored_roles", []) for role in user_roles):
+            if guild_filter.ignored_roles and not guild_filter.ignored_roles.isdisjoint(role.id for role in getattr(user, 'roles', ())):
                 return True
         return False
 
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: Guild):
+        self.evict_guild_config(guild.id)
+        self.invalidate_cached_webhook(guild.id)
+        self.reset_destination_breakers(guild.id)
+        self.audit_log_index.pop(guild.id, None)
+        self.invalidate_guild_capabilities(guild.id)
+        self.invite_uses.pop(guild.id, None)
+        for key in [key for key in self.audit_log_fetch_cache if key[0] == guild.id]:
+            del self.audit_log_fetch_cache[key]
+        for key in [key for key in self.admission_states if key[0] == guild.id]:
+            state = self.admission_states.pop(key)
+            if state["monitor"] and not state["monitor"].done():
+                state["monitor"].cancel()
+
     @commands.Cog.listener()
     async def on_member_join(self, member: Member):
         guild = member.guild
+        if self._is_log_suspended(guild.id, "server", claim_probe=False):
+            return
+        if not self.session or not await self._resolve_log_channel(guild, "server"):
+            return
+        if not self._admit_log(guild, "server"):
+            self.invite_uses.pop(guild.id, None)
+            return
         current_time = get_indian_time()
         user_avatar_url = member.avatar.url if member.avatar else (self.bot.user.avatar.url if self.bot.user.avatar else None)
 
@@ -813,10 +2133,8 @@ class LoggingCog(commands.Cog):
             invite_creator_avatar = self.bot.user.avatar.url if self.bot.user.avatar else None
 
             try:
-                invites = await guild.invites()
-                potential_invite = max(invites, key=lambda i: i.uses if i.uses is not None else -1, default=None)
-                
-                if potential_invite and potential_invite.uses and potential_invite.uses > 0:
+                potential_invite = await self.detect_used_invite(guild)
+                if potential_invite:
                     invite_code = potential_invite.code
                     invite_link = potential_invite.url
                     if potential_invite.inviter:
@@ -840,32 +2158,38 @@ class LoggingCog(commands.Cog):
         )
         embed.set_footer(text=f"{invite_creator_name}", icon_url=invite_creator_avatar if invite_creator_avatar else (self.bot.user.avatar.url if self.bot.user.avatar else None))
         embed.set_thumbnail(url=user_avatar_url)
-        await self.send_embed(guild, "server", embed)
+        await self.send_embed(guild, "server", embed, admitted=True)
 
     @commands.Cog.listener()
     async def on_member_remove(self, member: Member):
         guild = member.guild
+        moderation_suspended = self._is_log_suspended(guild.id, "moderation", claim_probe=False)
+        if moderation_suspended and self._is_log_suspended(guild.id, "server", claim_probe=False):
+            return
         current_time = get_indian_time()
         user_avatar_url = member.avatar.url if member.avatar else (self.bot.user.avatar.url if self.bot.user.avatar else None)
-        try:
-            async for entry in guild.audit_logs(limit=1, action=discord.AuditLogAction.kick):
-                if entry.target.id == member.id and (get_indian_time() - entry.created_at).total_seconds() < 5:
-                    moderator = entry.user
-                    reason = entry.reason if entry.reason else "No reason specified"
-                    embed = discord.Embed(
-                        title="Member Kicked",
-                        description=f"> **Member :** {member.name}({member.mention})\n> **Reason :** {reason}",
-                        color=13516350,
-                        timestamp=current_time
-                    )
-                    embed.set_footer(text=moderator.name, icon_url=moderator.avatar.url if moderator.avatar else None)
-                    embed.set_thumbnail(url=user_avatar_url)
-                    await self.send_embed(guild, "moderation", embed)
-                    return 
-        except discord.Forbidden:
-            print(f"Missing 'View Audit Log' permission in guild {guild.id} to check for kicks.")
-        except Exception as e:
-            print(f"Error checking for kick audit log in {guild.id}: {e}")
+        if not moderation_suspended:
+            try:
+                for entry in await self.recent_audit_log_entries(guild, discord.AuditLogAction.kick, member.id, limit=1, time_window=5):
+                    if entry.target.id == member.id and (get_indian_time() - entry.created_at).total_seconds() < 5:
+                        moderator = entry.user
+                        reason = entry.reason if entry.reason else "No reason specified"
+                        embed = discord.Embed(
+                            title="Member Kicked",
+                            description=f"> **Member :** {member.name}({member.mention})\n> **Reason :** {reason}",
+                            color=13516350,
+                            timestamp=current_time
+                        )
+                        embed.set_footer(text=moderator.name, icon_url=moderator.avatar.url if moderator.avatar else None)
+                        embed.set_thumbnail(url=user_avatar_url)
+                        await self.send_embed(guild, "moderation", embed)
+                        return 
+            except discord.Forbidden:
+                print(f"Missing 'View Audit Log' permission in guild {guild.id} to check for kicks.")
+            except Exception as e:
+                print(f"Error checking for kick audit log in {guild.id}: {e}")
+        if self._is_log_suspended(guild.id, "server", claim_probe=False):
+            return
         if member.bot:
             title = "Bot left"
             description_lines = [
@@ -897,18 +2221,19 @@ class LoggingCog(commands.Cog):
     async def on_message_delete(self, message: discord.Message):
         if message.guild is None:
             return
-        config = await self.get_guild_config_async(message.guild.id)
-        if not config.get("logging_enabled"):
+        if self._is_log_suspended(message.guild.id, "message", claim_probe=False):
+            return
+        guild_filter = await self.get_guild_filter(message.guild.id)
+        if not guild_filter.logging_enabled:
             return
         if message.author.bot:
-            ignore_embeds = config.get("ignore_embeds", False)
+            ignore_embeds = guild_filter.ignore_embeds
             files_to_send = []
             attachment_details_for_embed = []
             if message.attachments:
                 for a in message.attachments:
                     try:
-                        file = await a.to_file()
-                        files_to_send.append(file)
+                        files_to_send.append(await read_log_attachment(a))
                         attachment_details_for_embed.append(f"> [{a.filename}]({a.url})")
                     except Exception as e:
                         print(f"Error converting attachment '{a.filename}' to file for logging: {e}")
@@ -980,8 +2305,7 @@ class LoggingCog(commands.Cog):
         if message.attachments:
             for a in message.attachments:
                 try:
-                    file = await a.to_file()
-                    files_to_send.append(file)
+                    files_to_send.append(await read_log_attachment(a))
                     attachment_details_for_embed.append(f"> [{a.filename}]({a.url})")
                 except Exception as e:
                     print(f"Error converting attachment '{a.filename}' to file for logging: {e}")
@@ -1025,6 +2349,8 @@ class LoggingCog(commands.Cog):
         channel = messages[0].channel
         if not guild or not isinstance(channel, TextChannel):
             return
+        if self._is_log_suspended(guild.id, "message", claim_probe=False):
+            return
         purged_count = len(messages)
         log_content = io.StringIO()
         log_content.write(f"Bulk Message Delete Log for Channel: #{channel.name} ({channel.id})\n")
@@ -1056,7 +2382,7 @@ class LoggingCog(commands.Cog):
                 log_content.write("\n")
             log_content.write("-" * 30 + "\n") 
         log_file_name = f"bulk_delete_log_{channel.name}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        log_file = discord.File(io.BytesIO(log_content.getvalue().encode('utf-8')), filename=log_file_name)
+        log_file = LogAttachment(log_file_name, log_content.getvalue().encode('utf-8'))
         embed = discord.Embed(
             title=f"{purged_count} Messages Deleted",
             description=f"> **Channel :** {channel.name} ({channel.mention})",
@@ -1068,10 +2394,12 @@ class LoggingCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_message_edit(self, before: discord.Message, after: discord.Message):
-        config = await self.get_guild_config_async(before.guild.id)
-        if not config.get("logging_enabled"):
+        if before.guild is None or self._is_log_suspended(before.guild.id, "message", claim_probe=False):
+            return
+        guild_filter = await self.get_guild_filter(before.guild.id)
+        if not guild_filter.logging_enabled:
             return
-        ignore_embeds = config.get("ignore_embeds", False)
+        ignore_embeds = guild_filter.ignore_embeds
         if before.guild is None or(before.content == after.content and before.embeds == after.embeds):
             return
         def extract_embed_details(embed: discord.Embed):
@@ -1137,7 +2465,7 @@ class LoggingCog(commands.Cog):
         channel = guild.get_channel(payload.channel_id)
         if not channel or not isinstance(channel, TextChannel):
             return
-        if await self._is_ignored(guild.id, user=payload.member, channel=channel):
+        if await self._is_ignored(guild.id, user=payload.member, channel=channel, log_type="message"):
             return
         try:
             message = await channel.fetch_message(payload.message_id)
@@ -1170,7 +2498,7 @@ class LoggingCog(commands.Cog):
         if not channel or not isinstance(channel, TextChannel):
             return
         member = guild.get_member(payload.user_id)
-        if await self._is_ignored(guild.id, user=member, channel=channel):
+        if await self._is_ignored(guild.id, user=member, channel=channel, log_type="message"):
             return
         try:
             message = await channel.fetch_message(payload.message_id)
@@ -1198,9 +2526,11 @@ class LoggingCog(commands.Cog):
     async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
         if not channel.guild:
             return
+        if self._is_log_suspended(channel.guild.id, "channel", claim_probe=False):
+            return
         creator = None
         try:
-            async for entry in channel.guild.audit_logs(limit=1, action=AuditLogAction.channel_create):
+            for entry in await self.recent_audit_log_entries(channel.guild, AuditLogAction.channel_create, channel.id, limit=1, time_window=5):
                 if entry.target.id == channel.id and (get_indian_time() - entry.created_at).total_seconds() < 5:
                     creator = entry.user
                     break
@@ -1230,11 +2560,11 @@ class LoggingCog(commands.Cog):
     async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
         if not channel.guild:
             return
-        if await self._is_ignored(channel.guild.id, channel=channel):
+        if await self._is_ignored(channel.guild.id, channel=channel, log_type="channel"):
             return
         deleter = None
         try:
-            async for entry in channel.guild.audit_logs(limit=1, action=AuditLogAction.channel_delete):
+            for entry in await self.recent_audit_log_entries(channel.guild, AuditLogAction.channel_delete, channel.id, limit=1, time_window=5):
                 if entry.target.id == channel.id and (get_indian_time() - entry.created_at).total_seconds() < 5:
                     deleter = entry.user
                     break
@@ -1287,12 +2617,12 @@ class LoggingCog(commands.Cog):
     async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
         if not before.guild:
             return
-        if await self._is_ignored(before.guild.id, channel=after):
+        if await self._is_ignored(before.guild.id, channel=after, log_type="channel"):
             return
         action_user = None
         audit_log_reason = None 
         try:
-            async for entry in before.guild.audit_logs(limit=5, action=AuditLogAction.channel_update):
+            for entry in await self.recent_audit_log_entries(before.guild, AuditLogAction.channel_update, after.id, limit=5, time_window=10):
                 if entry.target.id == after.id and (get_indian_time() - entry.created_at).total_seconds() < 10:
                     action_user = entry.user
                     audit_log_reason = entry.reason
@@ -1423,11 +2753,155 @@ class LoggingCog(commands.Cog):
         for embed in embeds_to_send:
             await self.send_embed(after.guild, "channel", embed)
 
+    def _index_audit_log_entry(self, entry: discord.AuditLogEntry):
+        cutoff = discord.utils.utcnow() - datetime.timedelta(seconds=self.audit_log_index_ttl)
+        if entry.user_id is None or entry.created_at < cutoff:
+            return
+        guild_index = self.audit_log_index.get(entry.guild.id)
+        if guild_index is None:
+            guild_index = self.audit_log_index[entry.guild.id] = OrderedDict()
+        key = (entry.action, getattr(entry.target, "id", None))
+        guild_index[key] = (entry, *guild_index.pop(key, ())[:4])
+        for future in self.audit_log_waiters.pop((entry.guild.id, *key), ()):
+            if not future.done():
+                future.set_result(entry)
+        self._prune_audit_log_index(entry.guild.id, cutoff)
+        self._start_audit_log_pruning()
+
+    def _start_audit_log_pruning(self):
+        if self.audit_log_prune_task is None or self.audit_log_prune_task.done():
+            self.audit_log_prune_task = asyncio.create_task(self._audit_log_prune_loop())
+
+    def _prune_audit_log_index(self, guild_id: int, cutoff: datetime.datetime):
+        guild_index = self.audit_log_index.get(guild_id)
+        while guild_index:
+            oldest_key, oldest_entries = next(iter(guild_index.items()))
+            if len(guild_index) <= self.audit_log_index_size and oldest_entries[0].created_at >= cutoff:
+                break
+            del guild_index[oldest_key]
+        if guild_index is not None and not guild_index:
+            del self.audit_log_index[guild_id]
+
+    async def _audit_log_prune_loop(self):
+        while self.audit_log_index or self.audit_log_fetch_cache:
+            await asyncio.sleep(self.audit_log_fetch_ttl if self.audit_log_fetch_cache else self.audit_log_index_ttl)
+            cutoff = discord.utils.utcnow() - datetime.timedelta(seconds=self.audit_log_index_ttl)
+            for guild_id in list(self.audit_log_index):
+                self._prune_audit_log_index(guild_id, cutoff)
+            now = time.monotonic()
+            for key in [key for key, (fetched_at, _) in self.audit_log_fetch_cache.items() if now - fetched_at >= self.audit_log_fetch_ttl]:
+                del self.audit_log_fetch_cache[key]
+
+    def _indexed_audit_log_entries(self, guild_id: int, actions: tuple, target_id, time_window: float, resolved_target: bool) -> list:
+        self._prune_audit_log_index(guild_id, discord.utils.utcnow() - datetime.timedelta(seconds=self.audit_log_index_ttl))
+        guild_index = self.audit_log_index.get(guild_id)
+        if not guild_index:
+            return []
+        cutoff = discord.utils.utcnow() - datetime.timedelta(seconds=time_window)
+        if target_id is None:
+            candidates = [entry for (action, _), entries in guild_index.items() if action in actions for entry in entries]
+        else:
+            candidates = [entry for action in actions for entry in guild_index.get((action, target_id), ())]
+        entries = [
+            entry for entry in candidates
+            if entry.created_at >= cutoff and not (resolved_target and isinstance(entry.target, discord.Object))
+        ]
+        entries.sort(key=lambda entry: entry.id, reverse=True)
+        return entries
+
+    async def _resolve_audit_log_users(self, guild: Guild, entries: list) -> list:
+        resolved = []
+        for entry in entries:
+            if entry.user is None:
+                entry.user = guild.get_member(entry.user_id) or self.bot.get_user(entry.user_id)
+            if entry.user is None:
+                config = await self.get_guild_config_async(guild.id)
+                if not config.get("logging_enabled"):
+                    continue
+                try:
+                    entry.user = await self.bot.fetch_user(entry.user_id)
+                except discord.HTTPException:
+                    continue
+            resolved.append(entry)
+        return resolved
+
+    async def wait_for_audit_log_entry(self, guild: Guild, action, target_id, timeout: float = None, time_window: float = 60):
+        actions = (action,) if isinstance(action, AuditLogAction) else tuple(action)
+        entries = self._indexed_audit_log_entries(guild.id, actions, target_id, time_window, False)
+        if entries:
+            return entries[0]
+        future = asyncio.get_running_loop().create_future()
+        keys = [(guild.id, action, target_id) for action in actions]
+        for key in keys:
+            self.audit_log_waiters.setdefault(key, []).append(future)
+        try:
+            entry = await asyncio.wait_for(future, timeout or self.audit_log_wait_timeout)
+            self.metrics["audit_log_waits_resolved"] += 1
+            return entry
+        except asyncio.TimeoutError:
+            self.metrics["audit_log_waits_timed_out"] += 1
+            return None
+        finally:
+            for key in keys:
+                waiters = self.audit_log_waiters.get(key)
+                if waiters and future in waiters:
+                    waiters.remove(future)
+                    if not waiters:
+                        del self.audit_log_waiters[key]
+
+    async def recent_audit_log_entries(self, guild: Guild, action, target_id=None, limit: int = 5, time_window: float = 60, resolved_target: bool = False) -> list:
+        if not self.get_guild_capabilities(guild).view_audit_log:
+            self.metrics["audit_log_calls_skipped"] += 1
+            return []
+        actions = (action,) if isinstance(action, AuditLogAction) else tuple(action)
+        indexed = self._indexed_audit_log_entries(guild.id, actions, target_id, time_window, resolved_target)
+        entries = await self._resolve_audit_log_users(guild, indexed[:limit])
+        if entries:
+            self.metrics["audit_log_index_hits"] += 1
+            return entries
+        self.metrics["audit_log_index_misses"] += 1
+        if not indexed and target_id is not None and self.bot.intents.moderation:
+            entry = await self.wait_for_audit_log_entry(guild, actions, target_id, time_window=time_window)
+            if entry is None:
+                return []
+            entries = await self._resolve_audit_log_users(guild, [entry])
+            if entries:
+                return entries
+        entries = await self.fetch_audit_log_entries(guild, actions)
+        if target_id is not None:
+            entries = [entry for entry in entries if getattr(entry.target, "id", None) == target_id]
+        return entries[:limit]
+
+    async def fetch_audit_log_entries(self, guild: Guild, actions: tuple) -> list:
+        key = (guild.id, actions)
+        cached = self.audit_log_fetch_cache.get(key)
+        if cached is not None:
+            if time.monotonic() - cached[0] < self.audit_log_fetch_ttl:
+                self.metrics["audit_log_fetches_avoided"] += 1
+                return cached[1]
+            del self.audit_log_fetch_cache[key]
+        fetch = self.audit_log_fetches.get(key)
+        if fetch is not None:
+            self.metrics["audit_log_fetches_avoided"] += 1
+            return await asyncio.shield(fetch)
+        fetch = asyncio.create_task(self._fetch_audit_log_entries(guild, actions))
+        self.audit_log_fetches[key] = fetch
+        fetch.add_done_callback(lambda _: self.audit_log_fetches.pop(key, None))
+        return await asyncio.shield(fetch)
+
+    async def _fetch_audit_log_entries(self, guild: Guild, actions: tuple) -> list:
+        self.metrics["audit_log_fetches"] += 1
+        filters = {"action": actions[0]} if len(actions) == 1 else {}
+        entries = [entry async for entry in guild.audit_logs(limit=self.audit_log_fetch_limit, **filters)]
+        self.audit_log_fetch_cache[(guild.id, actions)] = (time.monotonic(), entries)
+        self._start_audit_log_pruning()
+        return entries
+
     async def _get_audit_log_entry_for_member_update(self, guild: discord.Guild, member: Member, time_window: int = 15):
         action_user = None
         audit_log_reason = None
         try:
-            async for entry in guild.audit_logs(limit=10, action=AuditLogAction.member_update):
+            for entry in await self.recent_audit_log_entries(guild, AuditLogAction.member_update, member.id, limit=10, time_window=time_window):
                 if entry.target and entry.target.id == member.id and \
                    (get_indian_time() - entry.created_at).total_seconds() < time_window:
                     action_user = entry.user
@@ -1441,6 +2915,10 @@ class LoggingCog(commands.Cog):
     async def on_member_update(self, before: Member, after: Member):
         if before.guild is None:
             return
+        if after.id == self.bot.user.id and before.roles != after.roles:
+            self.invalidate_guild_capabilities(after.guild.id)
+        if self._is_log_suspended(after.guild.id, "member", claim_probe=False) and (before.roles == after.roles or self._is_log_suspended(after.guild.id, "alert", claim_probe=False)):
+            return
         if await self._is_ignored(before.guild.id, user=after):
             return
         def get_reason_line_for_member(reason):
@@ -1448,18 +2926,18 @@ class LoggingCog(commands.Cog):
                 return f"> **Reason :** {reason}"
             return ""
         audit_logs_role_update = []
-        try:
-            async for entry in before.guild.audit_logs(limit=20, action=AuditLogAction.member_role_update):
-                if entry.target.id == after.id and (get_indian_time() - entry.created_at).total_seconds() < 60:
-                    audit_logs_role_update.append(entry)
-        except discord.Forbidden:
-            print(f"Missing 'View Audit Log' permission in guild {before.guild.id}. Cannot fetch audit log entries for member updates.")
-            audit_log_reason_global = "Missing Audit Log permissions" 
-        except Exception as e:
-            print(f"Error fetching audit logs for member update in guild {before.guild.id}: {e}")
-            audit_log_reason_global = "Error fetching reason"
-        else:
-            audit_log_reason_global = None 
+        audit_log_reason_global = None
+        if before.roles != after.roles:
+            try:
+                for entry in await self.recent_audit_log_entries(before.guild, AuditLogAction.member_role_update, after.id, limit=20, time_window=60):
+                    if entry.target.id == after.id and (get_indian_time() - entry.created_at).total_seconds() < 60:
+                        audit_logs_role_update.append(entry)
+            except discord.Forbidden:
+                print(f"Missing 'View Audit Log' permission in guild {before.guild.id}. Cannot fetch audit log entries for member updates.")
+                audit_log_reason_global = "Missing Audit Log permissions"
+            except Exception as e:
+                print(f"Error fetching audit logs for member update in guild {before.guild.id}: {e}")
+                audit_log_reason_global = "Error fetching reason"
         def create_base_embed(title, color, user_avatar_url):
             embed = discord.Embed(
                 title=title,
@@ -1471,7 +2949,10 @@ class LoggingCog(commands.Cog):
         guild = before.guild
         current_time = get_indian_time()
         user_avatar_url = after.avatar.url if after.avatar else (self.bot.user.avatar.url if self.bot.user.avatar else None)
-        action_user, audit_log_reason = await self._get_audit_log_entry_for_member_update(guild, after)
+        if before.nick != after.nick or before.timed_out_until != after.timed_out_until:
+            action_user, audit_log_reason = await self._get_audit_log_entry_for_member_update(guild, after)
+        else:
+            action_user, audit_log_reason = None, None
         actor_name = action_user.name if action_user else "Unknown User"
         actor_avatar_url = action_user.avatar.url if action_user and action_user.avatar else (self.bot.user.avatar.url if self.bot.user.avatar else None)
         reason_text = f"> **Reason :** {audit_log_reason}" if audit_log_reason else ""
@@ -1591,14 +3072,14 @@ class LoggingCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_ban(self, guild: Guild, user: discord.User):
-        if await self._is_ignored(guild.id, user=user):
+        if await self._is_ignored(guild.id, user=user, log_type="moderation"):
             return
         if user.id == self.bot.user.id:
             return
         moderator_user = None
         ban_reason = "No reason specified"
         try:
-            async for entry in guild.audit_logs(limit=1, action=AuditLogAction.ban):
+            for entry in await self.recent_audit_log_entries(guild, AuditLogAction.ban, user.id, limit=1, time_window=5):
                 if entry.target.id == user.id and (get_indian_time() - entry.created_at).total_seconds() < 5:
                     moderator_user = entry.user
                     if entry.reason:
@@ -1621,11 +3102,11 @@ class LoggingCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_member_unban(self, guild: Guild, user: discord.User):
-        if await self._is_ignored(guild.id, user=user):
+        if await self._is_ignored(guild.id, user=user, log_type="moderation"):
             return
         moderator_user = None
         try:
-            async for entry in guild.audit_logs(limit=1, action=AuditLogAction.unban):
+            for entry in await self.recent_audit_log_entries(guild, AuditLogAction.unban, user.id, limit=1, time_window=5):
                 if entry.target.id == user.id and (get_indian_time() - entry.created_at).total_seconds() < 5:
                     moderator_user = entry.user
                     break
@@ -1648,7 +3129,7 @@ class LoggingCog(commands.Cog):
         action_user = None
         audit_log_reason = "No reason specified"
         try:
-            async for entry in guild.audit_logs(limit=10, action=action_type):
+            for entry in await self.recent_audit_log_entries(guild, action_type, target_id, limit=10, time_window=time_window):
                 if entry.target and entry.target.id == target_id and \
                    (get_indian_time() - entry.created_at).total_seconds() < time_window:
                     action_user = entry.user
@@ -1664,6 +3145,8 @@ class LoggingCog(commands.Cog):
     
     @commands.Cog.listener()
     async def on_guild_role_create(self, role: discord.Role):
+        if self._is_log_suspended(role.guild.id, "role", claim_probe=False):
+            return
         action_user, audit_log_reason = await self.get_audit_log_entry_for_role(
             role.guild, AuditLogAction.role_create, role.id
         )
@@ -1687,6 +3170,9 @@ class LoggingCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_guild_role_delete(self, role: discord.Role):
+        self.invalidate_guild_capabilities(role.guild.id)
+        if self._is_log_suspended(role.guild.id, "role", claim_probe=False):
+            return
         action_user, audit_log_reason = await self.get_audit_log_entry_for_role(
             role.guild, AuditLogAction.role_delete, role.id
         )
@@ -1710,6 +3196,10 @@ class LoggingCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        if before.permissions != after.permissions and after.guild.me and after in after.guild.me.roles:
+            self.invalidate_guild_capabilities(after.guild.id)
+        if self._is_log_suspended(after.guild.id, "role", claim_probe=False):
+            return
         def create_role_update_embed(title: str, role: discord.Role, action_user: discord.User, reason: str):
             embed = discord.Embed(
                 title=title,
@@ -1823,8 +3313,10 @@ class LoggingCog(commands.Cog):
     @commands.Cog.listener()
     async def on_voice_state_update(self, member: Member, before: discord.VoiceState, after: discord.VoiceState):
         guild = member.guild
-        config = await self.get_guild_config_async(guild.id)
-        if config.get("voice_log_ignore", False) and await self._is_ignored(guild.id, user=member):
+        if self._is_log_suspended(guild.id, "voice", claim_probe=False):
+            return
+        guild_filter = await self.get_guild_filter(guild.id)
+        if guild_filter.voice_log_ignore and await self._is_ignored(guild.id, user=member):
             return
         current_time = get_indian_time()
         user_avatar_url = member.avatar.url if member.avatar else (self.bot.user.avatar.url if self.bot.user.avatar else None)
@@ -1911,10 +3403,12 @@ class LoggingCog(commands.Cog):
         if before.id != after.id:
             return
         guild = after
+        if self._is_log_suspended(guild.id, "server", claim_probe=False):
+            return
         action_user = None
         current_time_ist = get_indian_time()
         try:
-            async for entry in guild.audit_logs(limit=1, action=AuditLogAction.guild_update):
+            for entry in await self.recent_audit_log_entries(guild, AuditLogAction.guild_update, guild.id, limit=1, time_window=10):
                 if (current_time_ist - entry.created_at).total_seconds() < 10:
                     action_user = entry.user
                 break
@@ -2041,12 +3535,14 @@ class LoggingCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_invite_create(self, invite: discord.Invite):
-        if await self._is_ignored(invite.guild.id, channel=invite.channel):
+        if invite.guild.id in self.invite_uses:
+            self.invite_uses[invite.guild.id].setdefault(invite.code, invite.uses or 0)
+        if await self._is_ignored(invite.guild.id, channel=invite.channel, log_type="server"):
             return
         creator = None
         current_time = get_indian_time()
         try:
-            async for entry in invite.guild.audit_logs(limit=3, action=AuditLogAction.invite_create):
+            for entry in await self.recent_audit_log_entries(invite.guild, AuditLogAction.invite_create, invite.code, limit=3, time_window=5):
                 if entry.target and entry.target.code == invite.code and (current_time - entry.created_at).total_seconds() < 5:
                     creator = entry.user
                     break
@@ -2071,12 +3567,13 @@ class LoggingCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_invite_delete(self, invite: discord.Invite):
-        if await self._is_ignored(invite.guild.id, channel=invite.channel):
+        self.invite_uses.get(invite.guild.id, {}).pop(invite.code, None)
+        if await self._is_ignored(invite.guild.id, channel=invite.channel, log_type="server"):
             return
         deleter = None
         current_time = get_indian_time()
         try:
-            async for entry in invite.guild.audit_logs(limit=3, action=AuditLogAction.invite_delete):
+            for entry in await self.recent_audit_log_entries(invite.guild, AuditLogAction.invite_delete, invite.code, limit=3, time_window=5):
                 if entry.target and entry.target.code == invite.code and (current_time - entry.created_at).total_seconds() < 5:
                     deleter = entry.user
                     break
@@ -2097,13 +3594,13 @@ class LoggingCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_webhooks_update(self, channel: Union[TextChannel, VoiceChannel]):
-        if await self._is_ignored(channel.guild.id, channel=channel):
+        if await self._is_ignored(channel.guild.id, channel=channel, log_type="webhook"):
             return
         guild = channel.guild
         action_user = None
         audit_log_reason = None
         try:
-            async for entry in guild.audit_logs(limit=5):
+            for entry in await self.recent_audit_log_entries(guild, WEBHOOK_AUDIT_ACTIONS, None, limit=5, time_window=20, resolved_target=True):
                 if entry.action not in [AuditLogAction.webhook_create, AuditLogAction.webhook_delete, AuditLogAction.webhook_update]:
                     continue
                 if (get_indian_time() - entry.created_at).total_seconds() > 20:
@@ -2229,8 +3726,7 @@ class LoggingCog(commands.Cog):
         guild = entry.guild
         if not guild:
             return
-        if await self._is_ignored(guild.id, user=entry.user):
-            return
+        self._index_audit_log_entry(entry)
         relevant_actions = [
             AuditLogAction.integration_create,
             AuditLogAction.integration_delete,
@@ -2240,6 +3736,9 @@ class LoggingCog(commands.Cog):
             return
         if (get_indian_time() - entry.created_at).total_seconds() > 10:
             return
+        await self._resolve_audit_log_users(guild, [entry])
+        if await self._is_ignored(guild.id, user=entry.user, log_type="application"):
+            return
         action_user = entry.user
         audit_log_reason = entry.reason
         if entry.action == AuditLogAction.bot_add:
@@ -2263,7 +3762,8 @@ class LoggingCog(commands.Cog):
                 color=0x464a92,
                 timestamp=get_indian_time()
             )
-            embed.set_footer(text=action_user.name, icon_url=action_user.display_avatar.url)
+            if action_user:
+                embed.set_footer(text=action_user.name, icon_url=action_user.display_avatar.url)
             if application_avatar_url:
                 embed.set_thumbnail(url=application_avatar_url)
             await self.send_embed(guild, "application", embed)
@@ -2281,11 +3781,14 @@ class LoggingCog(commands.Cog):
                 color=0xce3636,
                 timestamp=get_indian_time()
             )
-            embed.set_footer(text=action_user.name, icon_url=action_user.display_avatar.url)
+            if action_user:
+                embed.set_footer(text=action_user.name, icon_url=action_user.display_avatar.url)
             await self.send_embed(guild, "application", embed)
 
     @commands.Cog.listener()
     async def on_guild_emojis_update(self, guild: discord.Guild, before: list[discord.Emoji], after: list[discord.Emoji]):
+        if self._is_log_suspended(guild.id, "server", claim_probe=False):
+            return
         current_time_ist = get_indian_time()
         try:
             if len(before) < len(after):
@@ -2293,7 +3796,7 @@ class LoggingCog(commands.Cog):
                 for emoji in new_emojis:
                     action_user = None
                     audit_log_reason = None
-                    async for entry in guild.audit_logs(limit=1, action=AuditLogAction.emoji_create):
+                    for entry in await self.recent_audit_log_entries(guild, AuditLogAction.emoji_create, emoji.id, limit=1, time_window=10):
                         if (current_time_ist - entry.created_at).total_seconds() < 10 and entry.target.id == emoji.id:
                             action_user = entry.user
                             audit_log_reason = entry.reason
@@ -2323,7 +3826,7 @@ class LoggingCog(commands.Cog):
                     action_user = None
                     audit_log_reason = None
                     creation_timestamp_display = "N/A"
-                    async for entry in guild.audit_logs(limit=1, action=AuditLogAction.emoji_delete):
+                    for entry in await self.recent_audit_log_entries(guild, AuditLogAction.emoji_delete, emoji.id, limit=1, time_window=10):
                         if (current_time_ist - entry.created_at).total_seconds() < 10 and getattr(entry.target, 'id', None) == emoji.id:
                             action_user = entry.user
                             audit_log_reason = entry.reason
@@ -2357,9 +3860,8 @@ class LoggingCog(commands.Cog):
                             async with aiohttp.ClientSession() as session:
                                 async with session.get(emoji.url) as resp:
                                     if resp.status == 200:
-                                        image_data = io.BytesIO(await resp.read())
                                         file_extension = 'gif' if emoji.animated else 'png'
-                                        emoji_file = discord.File(image_data, filename=f"emoji_{emoji.id}.{file_extension}")
+                                        emoji_file = LogAttachment(f"emoji_{emoji.id}.{file_extension}", await resp.read())
                         except Exception as e:
                             print(f"Error downloading emoji {emoji.id} for attachment: {e}")
                     await self.send_embed_files(guild, "server", embed, files=[emoji_file])
@@ -2370,7 +3872,7 @@ class LoggingCog(commands.Cog):
                         action_user = None
                         audit_log_reason = None
                         previous_name = old_emoji.name
-                        async for entry in guild.audit_logs(limit=1, action=AuditLogAction.emoji_update):
+                        for entry in await self.recent_audit_log_entries(guild, AuditLogAction.emoji_update, new_emoji.id, limit=1, time_window=10):
                             if (current_time_ist - entry.created_at).total_seconds() < 10 and entry.target.id == new_emoji.id:
                                 action_user = entry.user
                                 audit_log_reason = entry.reason
@@ -2402,6 +3904,8 @@ class LoggingCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_guild_stickers_update(self, guild: discord.Guild, before: list[discord.Sticker], after: list[discord.Sticker]):
+        if self._is_log_suspended(guild.id, "server", claim_probe=False):
+            return
         current_time_ist = get_indian_time()
         try:
             if len(before) < len(after):
@@ -2409,7 +3913,7 @@ class LoggingCog(commands.Cog):
                 for sticker in new_stickers:
                     action_user = None
                     audit_log_reason = None
-                    async for entry in guild.audit_logs(limit=1, action=AuditLogAction.sticker_create):
+                    for entry in await self.recent_audit_log_entries(guild, AuditLogAction.sticker_create, sticker.id, limit=1, time_window=10):
                         if (current_time_ist - entry.created_at).total_seconds() < 10 and entry.target.id == sticker.id:
                             action_user = entry.user
                             audit_log_reason = entry.reason
@@ -2440,7 +3944,7 @@ class LoggingCog(commands.Cog):
                     action_user = None
                     audit_log_reason = None
                     creation_timestamp_display = "N/A"
-                    async for entry in guild.audit_logs(limit=1, action=AuditLogAction.sticker_delete):
+                    for entry in await self.recent_audit_log_entries(guild, AuditLogAction.sticker_delete, sticker.id, limit=1, time_window=10):
                         if (current_time_ist - entry.created_at).total_seconds() < 10 and getattr(entry.target, 'id', None) == sticker.id:
                             action_user = entry.user
                             audit_log_reason = entry.reason
@@ -2475,8 +3979,7 @@ class LoggingCog(commands.Cog):
                             async with aiohttp.ClientSession() as session:
                                 async with session.get(sticker.url) as resp:
                                     if resp.status == 200:
-                                        image_data = io.BytesIO(await resp.read())
-                                        sticker_file = discord.File(image_data, filename=f"sticker_{sticker.id}.{sticker_extension}")
+                                        sticker_file = LogAttachment(f"sticker_{sticker.id}.{sticker_extension}", await resp.read())
                         except Exception as e:
                             print(f"Error downloading sticker {sticker.id} for attachment: {e}")
                     await self.send_embed_files(guild, "server", embed, files=[sticker_file] if sticker_file else [])
@@ -2485,7 +3988,7 @@ class LoggingCog(commands.Cog):
                     if old_sticker.id == new_sticker.id:
                         action_user = None
                         audit_log_reason = None
-                        async for entry in guild.audit_logs(limit=1, action=AuditLogAction.sticker_update):
+                        for entry in await self.recent_audit_log_entries(guild, AuditLogAction.sticker_update, new_sticker.id, limit=1, time_window=10):
                             if (current_time_ist - entry.created_at).total_seconds() < 10 and entry.target.id == new_sticker.id:
                                 action_user = entry.user
                                 audit_log_reason = entry.reason
@@ -2518,11 +4021,11 @@ class LoggingCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_thread_create(self, thread: Thread):
-        if await self._is_ignored(thread.guild.id, channel=thread.parent):
+        if await self._is_ignored(thread.guild.id, channel=thread.parent, log_type="thread"):
             return
         action_user = None
         try:
-            async for entry in thread.guild.audit_logs(limit=1, action=discord.AuditLogAction.thread_create):
+            for entry in await self.recent_audit_log_entries(thread.guild, discord.AuditLogAction.thread_create, thread.id, limit=1, time_window=10):
                 if entry.target.id == thread.id and (get_indian_time() - entry.created_at).total_seconds() < 10:
                     action_user = entry.user
                     break
@@ -2553,11 +4056,11 @@ class LoggingCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_thread_delete(self, thread: Thread):
-        if await self._is_ignored(thread.guild.id, channel=thread.parent):
+        if await self._is_ignored(thread.guild.id, channel=thread.parent, log_type="thread"):
             return
         action_user = None
         try:
-            async for entry in thread.guild.audit_logs(limit=1, action=discord.AuditLogAction.thread_delete):
+            for entry in await self.recent_audit_log_entries(thread.guild, discord.AuditLogAction.thread_delete, thread.id, limit=1, time_window=10):
                 if entry.target.id == thread.id and (get_indian_time() - entry.created_at).total_seconds() < 10:
                     action_user = entry.user
                     break
@@ -2582,11 +4085,11 @@ class LoggingCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_thread_update(self, before: Thread, after: Thread):
-        if await self._is_ignored(after.guild.id, channel=after.parent):
+        if await self._is_ignored(after.guild.id, channel=after.parent, log_type="thread"):
             return
         action_user = None
         try:
-            async for entry in after.guild.audit_logs(limit=5, action=discord.AuditLogAction.thread_update):
+            for entry in await self.recent_audit_log_entries(after.guild, discord.AuditLogAction.thread_update, after.id, limit=5, time_window=10):
                 if entry.target.id == after.id and (get_indian_time() - entry.created_at).total_seconds() < 10:
                     action_user = entry.user
                     break
@@ -2654,11 +4157,11 @@ class LoggingCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_stage_instance_create(self, stage_instance: StageInstance):
-        if await self._is_ignored(stage_instance.guild.id, channel=stage_instance.channel):
+        if await self._is_ignored(stage_instance.guild.id, channel=stage_instance.channel, log_type="stage"):
             return
         action_user = None
         try:
-            async for entry in stage_instance.guild.audit_logs(limit=1, action=discord.AuditLogAction.stage_instance_create):
+            for entry in await self.recent_audit_log_entries(stage_instance.guild, discord.AuditLogAction.stage_instance_create, stage_instance.id, limit=1, time_window=10):
                 if entry.target.id == stage_instance.id and (get_indian_time() - entry.created_at).total_seconds() < 10:
                     action_user = entry.user
                     break
@@ -2677,11 +4180,11 @@ class LoggingCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_stage_instance_delete(self, stage_instance: StageInstance):
-        if await self._is_ignored(stage_instance.guild.id, channel=stage_instance.channel):
+        if await self._is_ignored(stage_instance.guild.id, channel=stage_instance.channel, log_type="stage"):
             return
         action_user = None
         try:
-            async for entry in stage_instance.guild.audit_logs(limit=1, action=discord.AuditLogAction.stage_instance_delete):
+            for entry in await self.recent_audit_log_entries(stage_instance.guild, discord.AuditLogAction.stage_instance_delete, stage_instance.id, limit=1, time_window=10):
                 if entry.target.id == stage_instance.id and (get_indian_time() - entry.created_at).total_seconds() < 10:
                     action_user = entry.user
                     break
@@ -2700,13 +4203,13 @@ class LoggingCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_stage_instance_update(self, before: StageInstance, after: StageInstance):
-        if await self._is_ignored(after.guild.id, channel=after.channel):
+        if await self._is_ignored(after.guild.id, channel=after.channel, log_type="stage"):
             return
         if before.topic == after.topic:
             return
         action_user = None
         try:
-            async for entry in after.guild.audit_logs(limit=1, action=discord.AuditLogAction.stage_instance_update):
+            for entry in await self.recent_audit_log_entries(after.guild, discord.AuditLogAction.stage_instance_update, after.id, limit=1, time_window=10):
                 if entry.target.id == after.id and (get_indian_time() - entry.created_at).total_seconds() < 10:
                     action_user = entry.user
                     break
@@ -2726,6 +4229,8 @@ class LoggingCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_scheduled_event_create(self, event: ScheduledEvent):
+        if self._is_log_suspended(event.guild.id, "schedule", claim_probe=False):
+            return
         action_user = event.creator
         description = (
             f"> **Event :** {event.name}\n"
@@ -2738,9 +4243,11 @@ class LoggingCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_scheduled_event_delete(self, event: ScheduledEvent):
+        if self._is_log_suspended(event.guild.id, "schedule", claim_probe=False):
+            return
         action_user = None
         try:
-            async for entry in event.guild.audit_logs(limit=1, action=discord.AuditLogAction.scheduled_event_delete):
+            for entry in await self.recent_audit_log_entries(event.guild, discord.AuditLogAction.scheduled_event_delete, event.id, limit=1, time_window=10):
                 if entry.target.id == event.id and (get_indian_time() - entry.created_at).total_seconds() < 10:
                     action_user = entry.user
                     break
@@ -2759,9 +4266,11 @@ class LoggingCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_scheduled_event_update(self, before: ScheduledEvent, after: ScheduledEvent):
+        if self._is_log_suspended(after.guild.id, "schedule", claim_probe=False):
+            return
         action_user = None
         try:
-            async for entry in after.guild.audit_logs(limit=5, action=discord.AuditLogAction.scheduled_event_update):
+            for entry in await self.recent_audit_log_entries(after.guild, discord.AuditLogAction.scheduled_event_update, after.id, limit=5, time_window=10):
                 if entry.target.id == after.id and (get_indian_time() - entry.created_at).total_seconds() < 10:
                     action_user = entry.user
                     break
@@ -2812,7 +4321,7 @@ class LoggingCog(commands.Cog):
             
     @commands.Cog.listener()
     async def on_scheduled_event_user_add(self, event: ScheduledEvent, user: User):
-        if await self._is_ignored(event.guild.id, user=user):
+        if await self._is_ignored(event.guild.id, user=user, log_type="schedule"):
             return
         description = f"> **Event :** {event.name}\n> **User :** @{user.name}({user.mention})"
         embed = discord.Embed(title="Subscribed to event", description=description, color=0xFF5858, timestamp=get_indian_time())
@@ -2821,7 +4330,7 @@ class LoggingCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_scheduled_event_user_remove(self, event: ScheduledEvent, user: User):
-        if await self._is_ignored(event.guild.id, user=user):
+        if await self._is_ignored(event.guild.id, user=user, log_type="schedule"):
             return
         description = f"> **Event :** {event.name}\n> **User :** @{user.name}({user.mention})"
         embed = discord.Embed(title="Unsubscribed from event", description=description, color=0xCE3636, timestamp=get_indian_time())